@@ -0,0 +1,210 @@
+"""Admission control and load shedding for expensive routes.
+
+Each route class gets its own ``AdaptiveLimiter``: a concurrency limit that
+grows while latency stays under target and shrinks multiplicatively when it
+doesn't (AIMD), plus a bounded wait queue. Once the queue is full, requests are
+rejected immediately with 503 and ``Retry-After`` instead of piling up on DB
+connections. Routes outside every class (cheap reads such as the leaderboard
+and players lists) are never queued behind writes.
+
+Limits are sized against the engine's connection pool: the write and bulk
+classes together never hold more than the pool's capacity minus
+``ADMISSION_READ_RESERVED_CONNECTIONS`` connections, so admitted writes can't
+starve reads of connections (see ``write_max_limit``).
+"""
+import asyncio
+import math
+import time
+from collections import deque
+from typing import Dict, Optional, Tuple
+
+from fastapi.responses import JSONResponse
+
+from .config import settings
+from .database import pool_capacity
+from .models import ApiResponse, LimiterStats
+
+class AdmissionRejected(Exception):
+    def __init__(self, retry_after: int):
+        super().__init__(f"Admission rejected, retry after {retry_after}s")
+        self.retry_after = retry_after
+
+class AdaptiveLimiter:
+    def __init__(
+        self,
+        name: str,
+        initial_limit: int,
+        min_limit: int,
+        max_limit: int,
+        max_queue: int,
+        queue_timeout: float,
+        target_latency: float,
+        backoff: float = 0.9,
+    ):
+        self.name = name
+        self.limit = float(initial_limit)
+        self.min_limit = min_limit
+        self.max_limit = max_limit
+        self.max_queue = max_queue
+        self.queue_timeout = queue_timeout
+        self.target_latency = target_latency
+        self.backoff = backoff
+
+        self.in_flight = 0
+        self.admitted = 0
+        self.rejected = 0
+        self.avg_latency = 0.0
+        self._waiters: deque[asyncio.Future] = deque()
+
+    @property
+    def current_limit(self) -> int:
+        return max(self.min_limit, int(self.limit))
+
+    def retry_after(self) -> int:
+        # Rough time for the queue ahead of a new request (and the request itself) to drain
+        per_request = self.avg_latency or self.target_latency
+        return max(1, math.ceil((len(self._waiters) + 1) * per_request / self.current_limit))
+
+    async def acquire(self):
+        if self.in_flight < self.current_limit and not self._waiters:
+            self.in_flight += 1
+            self.admitted += 1
+            return
+
+        if len(self._waiters) >= self.max_queue:
+            self.rejected += 1
+            raise AdmissionRejected(self.retry_after())
+
+        waiter = asyncio.get_running_loop().create_future()
+        self._waiters.append(waiter)
+        try:
+            await asyncio.wait_for(waiter, self.queue_timeout)
+        except asyncio.TimeoutError:
+            if not self._granted(waiter):
+                self.rejected += 1
+                raise AdmissionRejected(self.retry_after())
+        except BaseException:
+            # Cancelled (e.g. client went away) right after being woken up
+            if self._granted(waiter):
+                self._free_slot()
+            raise
+        finally:
+            if waiter in self._waiters:
+                self._waiters.remove(waiter)
+        # _free_slot() already counted us into in_flight when it woke us
+        self.admitted += 1
+
+    @staticmethod
+    def _granted(waiter: asyncio.Future) -> bool:
+        return waiter.done() and not waiter.cancelled()
+
+    def _free_slot(self):
+        self.in_flight -= 1
+        while self._waiters and self.in_flight < self.current_limit:
+            waiter = self._waiters.popleft()
+            if not waiter.done():
+                self.in_flight += 1
+                waiter.set_result(None)
+
+    def release(self, latency: Optional[float]):
+        """Free a slot and feed the observed latency (``None`` for a failed request)."""
+        if latency is None or latency > self.target_latency:
+            self.limit = max(self.min_limit, self.limit * self.backoff)
+        elif self.in_flight >= self.current_limit:
+            # Only grow when the limit was actually the bottleneck
+            self.limit = min(self.max_limit, self.limit + 1 / self.limit)
+
+        if latency is not None:
+            self.avg_latency = latency if not self.avg_latency else 0.9 * self.avg_latency + 0.1 * latency
+
+        self._free_slot()
+
+    def stats(self) -> LimiterStats:
+        return LimiterStats(
+            name=self.name,
+            limit=self.current_limit,
+            inFlight=self.in_flight,
+            queued=len(self._waiters),
+            maxQueue=self.max_queue,
+            admitted=self.admitted,
+            rejected=self.rejected,
+            avgLatencyMs=round(self.avg_latency * 1000, 2),
+        )
+
+BULK_MAX_LIMIT = 2
+
+def write_max_limit(capacity: Optional[int]) -> int:
+    """``ADMISSION_WRITE_MAX_LIMIT``, capped so writes leave room in a pool of ``capacity`` for bulk and reads.
+
+    ``capacity`` is ``None`` for pools that never make a checkout wait, such as
+    in-memory SQLite's single shared connection; the setting is used as-is.
+    """
+    if capacity is None:
+        return settings.ADMISSION_WRITE_MAX_LIMIT
+    cap = capacity - BULK_MAX_LIMIT - settings.ADMISSION_READ_RESERVED_CONNECTIONS
+    return max(1, min(settings.ADMISSION_WRITE_MAX_LIMIT, cap))
+
+_write_max_limit = write_max_limit(pool_capacity())
+
+limiters: Dict[str, AdaptiveLimiter] = {
+    "write": AdaptiveLimiter(
+        "write",
+        initial_limit=min(settings.ADMISSION_WRITE_LIMIT, _write_max_limit),
+        min_limit=1,
+        max_limit=_write_max_limit,
+        max_queue=settings.ADMISSION_WRITE_QUEUE_SIZE,
+        queue_timeout=settings.ADMISSION_QUEUE_TIMEOUT,
+        target_latency=settings.ADMISSION_WRITE_TARGET_LATENCY,
+    ),
+    # Bulk export/import hold a connection for a long time; never run many at once
+    "bulk": AdaptiveLimiter(
+        "bulk",
+        initial_limit=1,
+        min_limit=1,
+        max_limit=BULK_MAX_LIMIT,
+        max_queue=0,
+        queue_timeout=settings.ADMISSION_QUEUE_TIMEOUT,
+        target_latency=300.0,
+    ),
+}
+
+ROUTE_CLASSES: Dict[Tuple[str, str], str] = {
+    ("POST", "/api/leaderboard"): "write",
+    ("POST", "/api/auth/signup"): "write",
+    ("GET", "/api/leaderboard/export"): "bulk",
+    ("POST", "/api/leaderboard/import"): "bulk",
+}
+
+class AdmissionControlMiddleware:
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or not settings.ADMISSION_ENABLED:
+            await self.app(scope, receive, send)
+            return
+
+        route_class = ROUTE_CLASSES.get((scope["method"], scope["path"].rstrip("/")))
+        if route_class is None:
+            await self.app(scope, receive, send)
+            return
+
+        limiter = limiters[route_class]
+        try:
+            await limiter.acquire()
+        except AdmissionRejected as e:
+            response = JSONResponse(
+                status_code=503,
+                content=ApiResponse(success=False, error="Server is busy, please retry later").model_dump(),
+                headers={"Retry-After": str(e.retry_after)},
+            )
+            await response(scope, receive, send)
+            return
+
+        started = time.perf_counter()
+        latency = None
+        try:
+            await self.app(scope, receive, send)
+            latency = time.perf_counter() - started
+        finally:
+            limiter.release(latency)
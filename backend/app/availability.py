@@ -0,0 +1,86 @@
+"""In-memory username/email availability index for signup.
+
+Each field has a Bloom filter, loaded from ``users`` at startup and updated
+whenever ``create_user`` inserts a row. A filter miss means the value is
+definitely free, which is the common case for a fresh name, and needs no
+database query. A filter hit may be a false positive, so it is confirmed with
+an exact lookup on the indexed unique column.
+
+The index is only a hint. Users inserted by another process are not in this
+process's filters, so a value can be reported free and still be taken. The
+unique constraints on ``users`` stay the source of truth: ``create_user`` turns
+a lost race into an ``IntegrityError`` rather than pre-checking.
+"""
+import hashlib
+import math
+
+from sqlalchemy import func
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.future import select
+
+from .config import settings
+from .db_models import User as DBUser
+
+class BloomFilter:
+    def __init__(self, capacity: int, error_rate: float):
+        capacity = max(1, capacity)
+        self.size = max(8, math.ceil(-capacity * math.log(error_rate) / math.log(2) ** 2))
+        self.hashes = max(1, round(self.size / capacity * math.log(2)))
+        self._bits = bytearray((self.size + 7) // 8)
+
+    def _positions(self, value: str):
+        # Double hashing: k positions from two independent 64-bit halves
+        digest = hashlib.blake2b(value.encode("utf-8"), digest_size=16).digest()
+        h1 = int.from_bytes(digest[:8], "little")
+        h2 = int.from_bytes(digest[8:], "little") | 1
+        return ((h1 + i * h2) % self.size for i in range(self.hashes))
+
+    def add(self, value: str):
+        for position in self._positions(value):
+            self._bits[position >> 3] |= 1 << (position & 7)
+
+    def __contains__(self, value: str) -> bool:
+        return all(self._bits[position >> 3] & (1 << (position & 7)) for position in self._positions(value))
+
+class AvailabilityIndex:
+    def __init__(self, capacity: int = settings.AVAILABILITY_INDEX_CAPACITY, error_rate: float = settings.AVAILABILITY_INDEX_ERROR_RATE):
+        self.error_rate = error_rate
+        self._reset(capacity)
+
+    def _reset(self, capacity: int):
+        self.usernames = BloomFilter(capacity, self.error_rate)
+        self.emails = BloomFilter(capacity, self.error_rate)
+
+    async def load(self, session: AsyncSession, chunk_size: int = 10000):
+        """Rebuild the filters from the ``users`` table."""
+        count = (await session.execute(select(func.count()).select_from(DBUser))).scalar_one()
+        # Leave room to grow before the false-positive rate degrades
+        self._reset(max(settings.AVAILABILITY_INDEX_CAPACITY, 2 * count))
+
+        stmt = select(DBUser.username, DBUser.email).execution_options(yield_per=chunk_size)
+        result = await session.stream(stmt)
+        async for username, email in result:
+            if username is not None:
+                self.usernames.add(username)
+            if email is not None:
+                self.emails.add(email)
+
+    def add(self, username: str, email: str):
+        self.usernames.add(username)
+        self.emails.add(email)
+
+    async def _exists(self, session: AsyncSession, column, value: str) -> bool:
+        result = await session.execute(select(DBUser.id).where(column == value).limit(1))
+        return result.first() is not None
+
+    async def is_username_available(self, session: AsyncSession, username: str) -> bool:
+        if username not in self.usernames:
+            return True
+        return not await self._exists(session, DBUser.username, username)
+
+    async def is_email_available(self, session: AsyncSession, email: str) -> bool:
+        if email not in self.emails:
+            return True
+        return not await self._exists(session, DBUser.email, email)
+
+availability_index = AvailabilityIndex()
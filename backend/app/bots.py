@@ -0,0 +1,226 @@
+"""Headless bot players for load-testing the players/spectate paths.
+
+A ``BotSwarm`` runs N simulated snakes on the server-side rules in
+``app.game``, each ticking at the speed a human game would run at. After every
+tick, a bot publishes its state through ``update_player`` the same way a live
+game does. When a bot dies, it is removed, optionally submits its final score
+through ``add_score``, and respawns, so the number of live players stays at N.
+
+Set ``BOT_PLAYERS`` to run a swarm inside the server, or measure memory per
+live player, the cost of ``/api/players`` and how far ticks fall behind
+schedule (``max_lag``) as N grows:
+    python -m app.bots --players 10,100,1000,10000,100000
+"""
+import argparse
+import asyncio
+import gc
+import heapq
+import json
+import logging
+import random
+import time
+import tracemalloc
+from typing import List, Optional, Set
+
+from .database import add_score, remove_player, update_player
+from .game import GRID_SIZE, Cell, Game, is_valid_direction_change, next_head, to_active_player
+from .models import Direction, GameMode
+
+logger = logging.getLogger(__name__)
+
+POLICIES = ("greedy", "wander")
+
+def _distance(a: Cell, b: Cell, game: Game) -> int:
+    dx, dy = abs(a[0] - b[0]), abs(a[1] - b[1])
+    if game.mode == GameMode.passthrough:
+        dx, dy = min(dx, game.grid_size - dx), min(dy, game.grid_size - dy)
+    return dx + dy
+
+class Bot:
+    def __init__(self, index: int, policy: str, mode: Optional[GameMode], grid_size: int, rng: random.Random):
+        self.id = f"bot-{index}"
+        self.username = f"bot_{index}"
+        self.policy = policy
+        self.fixed_mode = mode
+        self.grid_size = grid_size
+        self.rng = rng
+        self.new_game()
+
+    def new_game(self):
+        mode = self.fixed_mode or self.rng.choice(list(GameMode))
+        self.game = Game(mode, self.grid_size, self.rng)
+
+    def steer(self):
+        game = self.game
+        safe = [
+            d for d in Direction
+            if is_valid_direction_change(game.direction, d)
+            and not game.is_deadly(next_head(game.head, d, game.mode, game.grid_size))
+        ]
+        if not safe:
+            return
+
+        if self.policy == "greedy" and game.food is not None:
+            game.change_direction(min(safe, key=lambda d: _distance(
+                next_head(game.head, d, game.mode, game.grid_size), game.food, game)))
+        elif game.direction not in safe or self.rng.random() < 0.2:
+            game.change_direction(self.rng.choice(safe))
+
+    def publish(self):
+        update_player(to_active_player(self.id, self.username, self.game))
+
+class BotSwarm:
+    def __init__(
+        self,
+        count: int,
+        mode: Optional[GameMode] = None,
+        policy: str = "greedy",
+        submit_scores: bool = False,
+        grid_size: int = GRID_SIZE,
+        seed: Optional[int] = None,
+    ):
+        if policy not in POLICIES:
+            raise ValueError(f"Unknown policy {policy!r}, expected one of {POLICIES}")
+        # One generator for the whole swarm: a Random instance is ~5KB of state,
+        # which would otherwise dominate the per-player memory being measured
+        rng = random.Random(seed)
+        self.bots = [Bot(i, policy, mode, grid_size, rng) for i in range(count)]
+        self.submit_scores = submit_scores
+        self.ticks = 0
+        self.games_finished = 0
+        # Worst delay, in seconds, between when a tick was due and when it ran
+        self.max_lag = 0.0
+        self._pending: Set[asyncio.Task] = set()
+
+    def publish_all(self):
+        for bot in self.bots:
+            bot.publish()
+
+    def tick(self, bot: Bot):
+        bot.steer()
+        bot.game.step()
+        self.ticks += 1
+        if bot.game.is_game_over:
+            self._finish(bot)
+        bot.publish()
+
+    def tick_all(self):
+        for bot in self.bots:
+            self.tick(bot)
+
+    def _finish(self, bot: Bot):
+        remove_player(bot.id)
+        self.games_finished += 1
+        if self.submit_scores and bot.game.score > 0:
+            task = asyncio.create_task(self._submit(bot.username, bot.game.score, bot.game.mode))
+            self._pending.add(task)
+            task.add_done_callback(self._submitted)
+        bot.new_game()
+
+    def _submitted(self, task: asyncio.Task):
+        self._pending.discard(task)
+        # Retrieve the exception here, or asyncio reports it as never retrieved
+        if not task.cancelled() and task.exception() is not None:
+            logger.error("Bot score submission failed", exc_info=task.exception())
+
+    async def _submit(self, username: str, score: int, mode: GameMode):
+        from .database import AsyncSessionLocal
+
+        async with AsyncSessionLocal() as session:
+            await add_score(session, username, score, mode)
+
+    async def run(self, duration: Optional[float] = None):
+        """Tick every bot at its game speed until cancelled or ``duration`` elapses."""
+        loop = asyncio.get_running_loop()
+        start = loop.time()
+        # Spread the first ticks out so the bots don't all move in lockstep
+        schedule = [(start + bot.rng.random() * bot.game.speed / 1000, i, bot) for i, bot in enumerate(self.bots)]
+        heapq.heapify(schedule)
+        self.publish_all()
+
+        try:
+            while schedule and (duration is None or loop.time() - start < duration):
+                now = loop.time()
+                while schedule and schedule[0][0] <= now:
+                    due, i, bot = heapq.heappop(schedule)
+                    self.max_lag = max(self.max_lag, now - due)
+                    self.tick(bot)
+                    heapq.heappush(schedule, (due + bot.game.speed / 1000, i, bot))
+                await asyncio.sleep(max(0.0, schedule[0][0] - loop.time()))
+        finally:
+            for bot in self.bots:
+                remove_player(bot.id)
+            if self._pending:
+                await asyncio.gather(*self._pending, return_exceptions=True)
+
+# Scale measurement
+
+async def measure(count: int, requests: int, seed: int, run_seconds: float = 2.0) -> dict:
+    import httpx
+    from .database import active_players_store
+    from .main import app
+
+    active_players_store.clear()
+    gc.collect()
+    tracemalloc.start()
+    start = tracemalloc.get_traced_memory()[0]
+    swarm = BotSwarm(count, seed=seed)
+    gc.collect()
+    created = tracemalloc.get_traced_memory()[0]
+    swarm.publish_all()
+    gc.collect()
+    published = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+
+    started = time.perf_counter()
+    swarm.tick_all()
+    tick_ms = (time.perf_counter() - started) * 1000
+
+    async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://bots") as client:
+        timings: List[float] = []
+        size = 0
+        for _ in range(requests):
+            started = time.perf_counter()
+            response = await client.get("/api/players")
+            timings.append(time.perf_counter() - started)
+            size = len(response.content)
+
+    # Scheduled play: once one round of ticks takes longer than a game tick,
+    # the swarm can't keep up and max_lag grows
+    ticks = swarm.ticks
+    await swarm.run(duration=run_seconds)
+    ticks = swarm.ticks - ticks
+
+    active_players_store.clear()
+    return {
+        "players": count,
+        # What spectating costs per live player (the active_players_store entry),
+        # and what the simulation itself costs on top
+        "store_bytes_per_player": round((published - created) / count),
+        "bot_bytes_per_player": round((created - start) / count),
+        "tick_all_ms": round(tick_ms, 2),
+        "tick_us_per_player": round(tick_ms * 1000 / count, 2),
+        "players_endpoint_ms": round(sum(timings) / len(timings) * 1000, 2),
+        "players_endpoint_bytes": size,
+        "ticks_per_second": round(ticks / run_seconds) if run_seconds else None,
+        "max_lag_ms": round(swarm.max_lag * 1000, 2),
+    }
+
+async def main():
+    parser = argparse.ArgumentParser(description="Measure players/spectate cost with simulated players")
+    parser.add_argument("--players", default="10,100,1000,10000", help="Comma-separated swarm sizes")
+    parser.add_argument("--requests", type=int, default=3, help="GET /api/players calls per size")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--run-seconds", type=float, default=2.0, help="Scheduled play per size, for max_lag_ms")
+    args = parser.parse_args()
+
+    from .database import engine
+    engine.echo = False
+
+    results = [
+        await measure(int(n), args.requests, args.seed, args.run_seconds) for n in args.players.split(",")
+    ]
+    print(json.dumps(results, indent=2))
+
+if __name__ == "__main__":
+    asyncio.run(main())
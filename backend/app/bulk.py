@@ -0,0 +1,378 @@
+"""Streaming bulk export and import of leaderboard data.
+
+Export reads the ``leaderboard`` table through a server-side cursor in
+fixed-size chunks, so memory stays constant regardless of table size.
+Import parses the stream record by record (CSV fields may span lines) and
+writes it with multi-row inserts, committing once per batch.
+
+CLI usage:
+    python -m app.bulk export --format ndjson --output scores.ndjson
+    python -m app.bulk import scores.ndjson --format ndjson
+    python -m app.bulk generate 2000000 --format csv --output scores.csv
+"""
+import argparse
+import asyncio
+import csv
+import io
+import json
+import random
+import sys
+import time
+import uuid
+from datetime import date, timedelta
+from collections import deque, namedtuple
+from typing import AsyncIterable, AsyncIterator, Callable, Deque, Iterator, List, Optional, Tuple
+
+from sqlalchemy import insert
+from pydantic import ValidationError
+from sqlalchemy.exc import DBAPIError
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.future import select
+
+from .config import settings
+from .db_models import LeaderboardEntry as DBLeaderboardEntry
+from .models import ExportFormat, GameMode, ImportRecord, ImportResult
+
+COLUMNS = ("id", "username", "score", "mode", "date")
+
+MEDIA_TYPES = {
+    ExportFormat.ndjson: "application/x-ndjson",
+    ExportFormat.csv: "text/csv",
+}
+
+# Export
+
+def _encode_chunk(rows, fmt: ExportFormat) -> str:
+    if fmt == ExportFormat.csv:
+        buffer = io.StringIO()
+        writer = csv.writer(buffer, lineterminator="\n")
+        for row in rows:
+            writer.writerow([row.id, row.username, row.score, row.mode.value, row.date.isoformat()])
+        return buffer.getvalue()
+
+    return "".join(
+        json.dumps({
+            "id": row.id,
+            "username": row.username,
+            "score": row.score,
+            "mode": row.mode.value,
+            "date": row.date.isoformat(),
+        }) + "\n"
+        for row in rows
+    )
+
+async def export_leaderboard(
+    session: AsyncSession,
+    fmt: ExportFormat = ExportFormat.ndjson,
+    chunk_size: int = settings.EXPORT_CHUNK_SIZE,
+) -> AsyncIterator[str]:
+    """Yield the whole leaderboard as NDJSON or CSV text, one chunk at a time."""
+    # Plain column rows rather than ORM objects: nothing is added to the
+    # identity map, and yield_per keeps only one chunk buffered at a time.
+    stmt = select(
+        DBLeaderboardEntry.id,
+        DBLeaderboardEntry.username,
+        DBLeaderboardEntry.score,
+        DBLeaderboardEntry.mode,
+        DBLeaderboardEntry.date,
+    ).execution_options(yield_per=chunk_size)
+
+    if fmt == ExportFormat.csv:
+        yield ",".join(COLUMNS) + "\n"
+
+    result = await session.stream(stmt)
+    try:
+        async for rows in result.partitions():
+            yield _encode_chunk(rows, fmt)
+    finally:
+        await result.close()
+
+# Import
+
+class BulkImportError(ValueError):
+    """An import stopped part-way; ``result`` counts the batches already committed."""
+
+    def __init__(self, message: str, result: ImportResult):
+        super().__init__(message)
+        self.result = result
+
+async def _iter_lines(chunks: AsyncIterable[bytes]) -> AsyncIterator[str]:
+    """Decoded lines, line endings included (the last line may lack one).
+
+    A line longer than ``IMPORT_MAX_RECORD_BYTES`` is an error, so a file
+    without newlines can't be buffered whole.
+    """
+    pending = b""
+    line_number = 0
+    async for chunk in chunks:
+        pending += chunk
+        *lines, pending = pending.split(b"\n")
+        for line in lines:
+            line_number += 1
+            yield line.decode("utf-8") + "\n"
+        if len(pending) > settings.IMPORT_MAX_RECORD_BYTES:
+            raise ValueError(
+                f"Line {line_number + 1}: longer than IMPORT_MAX_RECORD_BYTES ({settings.IMPORT_MAX_RECORD_BYTES})"
+            )
+    if pending:
+        yield pending.decode("utf-8")
+
+class _LineFeed:
+    """Iterator a single ``csv.reader`` pulls physical lines from.
+
+    Lines are pushed in as they arrive, and a record is only read once all of
+    its lines are buffered, so the feed never runs dry mid-record.
+    """
+
+    def __init__(self):
+        self.lines: Deque[str] = deque()
+
+    def __iter__(self):
+        return self
+
+    def __next__(self) -> str:
+        if not self.lines:
+            raise StopIteration
+        return self.lines.popleft()
+
+def _parse_record(record) -> dict:
+    """Validate one decoded record (any JSON value, or a CSV row) into insert parameters."""
+    if isinstance(record, dict):
+        # CSV has no null: an empty id or date means "generate one"
+        record = {key: value for key, value in record.items() if value != ""}
+    row = ImportRecord.model_validate(record)
+    return {
+        "id": row.id or str(uuid.uuid4()),
+        "username": row.username,
+        "score": row.score,
+        "mode": row.mode,
+        "date": row.date or date.today(),
+    }
+
+def _describe(error: ValidationError) -> str:
+    return "; ".join(
+        f"{'.'.join(map(str, e['loc'])) or 'record'}: {e['msg']}" for e in error.errors()
+    )
+
+async def _iter_records(chunks: AsyncIterable[bytes], fmt: ExportFormat) -> AsyncIterator[Tuple[int, dict]]:
+    """Yield ``(line number, record)`` pairs; the line number is where the record ends."""
+    if fmt == ExportFormat.ndjson:
+        line_number = 0
+        async for line in _iter_lines(chunks):
+            line_number += 1
+            if line.strip():
+                try:
+                    yield line_number, json.loads(line)
+                except ValueError as e:
+                    raise ValueError(f"Line {line_number}: invalid record ({e!r})") from e
+        return
+
+    # Quoted fields may span lines (e.g. a username containing a newline), so
+    # one reader parses the whole stream. CSV escapes quotes by doubling them,
+    # so a record is complete once its lines hold an even number of quotes.
+    # An unclosed quote would swallow the rest of the file, so a record is
+    # capped at IMPORT_MAX_RECORD_BYTES.
+    feed = _LineFeed()
+    reader = csv.DictReader(feed)
+    header_read = False
+    quotes = 0
+    buffered = 0
+    line_number = 0
+    async for line in _iter_lines(chunks):
+        line_number += 1
+        if not feed.lines and not line.strip():
+            continue
+        feed.lines.append(line)
+        quotes += line.count('"')
+        if quotes % 2:
+            buffered += len(line)
+            if buffered > settings.IMPORT_MAX_RECORD_BYTES:
+                start = line_number - len(feed.lines) + 1
+                raise ValueError(
+                    f"Line {start}: unterminated quoted field "
+                    f"(record longer than IMPORT_MAX_RECORD_BYTES, {settings.IMPORT_MAX_RECORD_BYTES})"
+                )
+            continue
+        quotes = 0
+        buffered = 0
+        if not header_read:
+            # Reading fieldnames consumes the header record
+            header_read = reader.fieldnames is not None
+            continue
+        yield line_number, next(reader)
+
+    if feed.lines:
+        raise ValueError(f"Line {line_number}: unterminated quoted field")
+
+async def import_leaderboard(
+    session: AsyncSession,
+    chunks: AsyncIterable[bytes],
+    fmt: ExportFormat = ExportFormat.ndjson,
+    batch_size: int = settings.IMPORT_BATCH_SIZE,
+    progress: Optional[Callable[[ImportResult], None]] = None,
+) -> ImportResult:
+    """Insert leaderboard rows read from ``chunks``, committing every ``batch_size`` rows.
+
+    Rows keep their ``id`` when one is given, so re-importing an export into
+    the same database fails on the primary key instead of duplicating scores.
+    Raises ``BulkImportError`` on a malformed record or a failed batch; the
+    batches before it stay committed and are counted in the error's ``result``.
+    """
+    result = ImportResult(imported=0, batches=0)
+    batch: List[dict] = []
+
+    async def flush():
+        # Core executemany against the table: SQLAlchemy's "insertmanyvalues"
+        # turns this into multi-row INSERTs where the driver benefits, without
+        # compiling a new statement per batch or going through the ORM
+        try:
+            await session.execute(insert(DBLeaderboardEntry.__table__), batch)
+            await session.commit()
+        except DBAPIError as e:
+            # Constraint violations, and values the driver rejects (e.g. out of range)
+            await session.rollback()
+            raise BulkImportError(f"Batch {result.batches + 1}: {e.orig}", result) from e
+        result.imported += len(batch)
+        result.batches += 1
+        batch.clear()
+        if progress:
+            progress(result)
+
+    try:
+        async for line_number, record in _iter_records(chunks, fmt):
+            try:
+                batch.append(_parse_record(record))
+            except ValidationError as e:
+                raise ValueError(f"Line {line_number}: invalid record ({_describe(e)})") from e
+
+            if len(batch) >= batch_size:
+                await flush()
+    except BulkImportError:
+        raise
+    except ValueError as e:
+        raise BulkImportError(str(e), result) from e
+
+    if batch:
+        await flush()
+    return result
+
+# Synthetic data
+
+_GeneratedRow = namedtuple("_GeneratedRow", COLUMNS)
+
+def generate_leaderboard(
+    count: int,
+    fmt: ExportFormat = ExportFormat.ndjson,
+    chunk_size: int = settings.EXPORT_CHUNK_SIZE,
+    seed: int = 0,
+) -> Iterator[str]:
+    """Yield ``count`` synthetic rows in export format, for load-testing import.
+
+    Every hundredth username holds a comma, a quote and a newline, so CSV
+    quoting is exercised at scale as well as in the unit tests.
+    """
+    if fmt == ExportFormat.csv:
+        yield ",".join(COLUMNS) + "\n"
+
+    rng = random.Random(seed)
+    modes = list(GameMode)
+    rows = []
+    for i in range(count):
+        username = f'player "{i}",\nline two' if i % 100 == 0 else f"player{i}"
+        rows.append(_GeneratedRow(
+            str(uuid.UUID(int=rng.getrandbits(128), version=4)),
+            username,
+            rng.randrange(10000),
+            modes[i % len(modes)],
+            date(2024, 1, 1) + timedelta(days=i % 365),
+        ))
+        if len(rows) == chunk_size:
+            yield _encode_chunk(rows, fmt)
+            rows = []
+    if rows:
+        yield _encode_chunk(rows, fmt)
+
+# CLI
+
+async def _read_file(path: str, chunk_size: int = 1 << 16) -> AsyncIterator[bytes]:
+    with open(path, "rb") as f:
+        while chunk := f.read(chunk_size):
+            yield chunk
+
+async def main():
+    parser = argparse.ArgumentParser(description="Bulk export/import of leaderboard data")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    export_parser = subparsers.add_parser("export", help="Stream the leaderboard to a file")
+    export_parser.add_argument("--format", type=ExportFormat, default=ExportFormat.ndjson)
+    export_parser.add_argument("--output", help="Output path (default: stdout)")
+    export_parser.add_argument("--chunk-size", type=int, default=settings.EXPORT_CHUNK_SIZE)
+
+    import_parser = subparsers.add_parser("import", help="Load leaderboard rows from a file")
+    import_parser.add_argument("path")
+    import_parser.add_argument("--format", type=ExportFormat, default=ExportFormat.ndjson)
+    import_parser.add_argument("--batch-size", type=int, default=settings.IMPORT_BATCH_SIZE)
+
+    generate_parser = subparsers.add_parser("generate", help="Write synthetic rows for load-testing import")
+    generate_parser.add_argument("rows", type=int)
+    generate_parser.add_argument("--format", type=ExportFormat, default=ExportFormat.ndjson)
+    generate_parser.add_argument("--output", help="Output path (default: stdout)")
+    generate_parser.add_argument("--seed", type=int, default=0)
+
+    args = parser.parse_args()
+
+    if args.command == "generate":
+        out = open(args.output, "w", newline="") if args.output else sys.stdout
+        try:
+            for chunk in generate_leaderboard(args.rows, args.format, seed=args.seed):
+                out.write(chunk)
+        finally:
+            if args.output:
+                out.close()
+        return
+
+    from .database import AsyncSessionLocal, engine
+    from .db_models import Base
+
+    # SQL echo goes to stdout, which would corrupt an export written there
+    engine.echo = False
+
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+
+    async with AsyncSessionLocal() as session:
+        if args.command == "export":
+            out = open(args.output, "w", newline="") if args.output else sys.stdout
+            try:
+                async for chunk in export_leaderboard(session, args.format, args.chunk_size):
+                    out.write(chunk)
+            finally:
+                if args.output:
+                    out.close()
+        else:
+            started = time.perf_counter()
+
+            def report(progress: ImportResult):
+                elapsed = time.perf_counter() - started
+                print(
+                    f"Imported {progress.imported} rows in {progress.batches} batches "
+                    f"({progress.imported / elapsed:.0f} rows/s)",
+                    file=sys.stderr,
+                )
+
+            try:
+                result = await import_leaderboard(
+                    session, _read_file(args.path), args.format, args.batch_size, progress=report
+                )
+            except BulkImportError as e:
+                print(
+                    f"Failed: {e} ({e.result.imported} rows in {e.result.batches} batches were committed)",
+                    file=sys.stderr,
+                )
+                sys.exit(1)
+            print(f"Done: {result.imported} rows imported", file=sys.stderr)
+
+    await engine.dispose()
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,179 @@
+"""Archival and compaction of the ``leaderboard`` table.
+
+Rows that can never appear in a ranking again are moved to the
+``leaderboard_archive`` table. A row can be moved when it is outside the top
+``retain_top`` scores of its mode and is older than ``min_age_days``. Every
+leaderboard view is a top-N by score, overall or per mode, and the overall top
+N is contained in the per-mode top N. Keeping each mode's top N is therefore
+enough.
+
+Rows are moved in small batches, and each batch is its own short transaction,
+so writers are never blocked for long.
+
+CLI usage:
+    python -m app.compaction --dry-run
+    python -m app.compaction --retain-top 100 --min-age-days 30
+"""
+import argparse
+import asyncio
+import logging
+from datetime import date, datetime, timedelta
+from typing import Dict, Optional
+
+from sqlalchemy import and_, delete, false, func, insert, or_
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.future import select
+
+from .config import settings
+from .db_models import LeaderboardArchiveEntry as DBLeaderboardArchiveEntry, LeaderboardEntry as DBLeaderboardEntry
+from .models import CompactionResult, GameMode
+
+logger = logging.getLogger(__name__)
+
+# Score, mode, date and per-row storage overhead, roughly; id and username
+# are measured exactly.
+_FIXED_ROW_BYTES = 32
+
+async def _retention_thresholds(session: AsyncSession, retain_top: int) -> Dict[GameMode, int]:
+    """Lowest score still inside each mode's top ``retain_top``.
+
+    Modes with fewer rows than that are left out, since all of their rows are kept.
+    """
+    thresholds = {}
+    for mode in GameMode:
+        stmt = (
+            select(DBLeaderboardEntry.score)
+            .where(DBLeaderboardEntry.mode == mode)
+            .order_by(DBLeaderboardEntry.score.desc())
+            .offset(retain_top - 1)
+            .limit(1)
+        )
+        threshold = (await session.execute(stmt)).scalar_one_or_none()
+        if threshold is not None:
+            thresholds[mode] = threshold
+    return thresholds
+
+def _archivable(thresholds: Dict[GameMode, int], cutoff: date):
+    # Strictly below the threshold, so ties with the last retained score are kept
+    outside_rankings = or_(false(), *(
+        and_(DBLeaderboardEntry.mode == mode, DBLeaderboardEntry.score < threshold)
+        for mode, threshold in thresholds.items()
+    ))
+    return and_(DBLeaderboardEntry.date < cutoff, outside_rankings)
+
+async def compact_leaderboard(
+    session: AsyncSession,
+    retain_top: int,
+    min_age_days: int,
+    batch_size: int,
+    dry_run: bool = False,
+) -> CompactionResult:
+    """Move archivable rows in batches of ``batch_size``, or just count them with ``dry_run``.
+
+    Raises ``ValueError`` when ``retain_top`` is below 1: an empty ranking would
+    archive every old row.
+    """
+    if retain_top < 1:
+        raise ValueError(f"retain_top must be at least 1, got {retain_top}")
+
+    # Thresholds only rise as new scores arrive, so rows below the ones taken
+    # here stay outside the rankings for the rest of the run.
+    thresholds = await _retention_thresholds(session, retain_top)
+    archivable = _archivable(thresholds, date.today() - timedelta(days=min_age_days))
+    row_bytes = func.length(DBLeaderboardEntry.id) + func.length(DBLeaderboardEntry.username) + _FIXED_ROW_BYTES
+
+    if dry_run:
+        stmt = select(func.count(), func.coalesce(func.sum(row_bytes), 0)).where(archivable)
+        rows, size = (await session.execute(stmt)).one()
+        await session.rollback()
+        return CompactionResult(rows=rows, bytes=size, batches=0, dryRun=True)
+
+    result = CompactionResult(rows=0, bytes=0, batches=0, dryRun=False)
+    while True:
+        stmt = select(
+            DBLeaderboardEntry.id,
+            DBLeaderboardEntry.username,
+            DBLeaderboardEntry.score,
+            DBLeaderboardEntry.mode,
+            DBLeaderboardEntry.date,
+            row_bytes.label("size"),
+        ).where(archivable).limit(batch_size)
+        rows = (await session.execute(stmt)).all()
+        if not rows:
+            break
+
+        archived_at = datetime.now()
+        await session.execute(insert(DBLeaderboardArchiveEntry.__table__), [
+            {
+                "id": row.id,
+                "username": row.username,
+                "score": row.score,
+                "mode": row.mode,
+                "date": row.date,
+                "archived_at": archived_at,
+            }
+            for row in rows
+        ])
+        await session.execute(
+            delete(DBLeaderboardEntry).where(DBLeaderboardEntry.id.in_([row.id for row in rows]))
+        )
+        await session.commit()
+
+        result.rows += len(rows)
+        result.bytes += sum(row.size for row in rows)
+        result.batches += 1
+        # Let other requests get at the database between batches
+        await asyncio.sleep(0)
+
+    return result
+
+async def run_compaction_forever(interval: Optional[int] = None):
+    """Background loop started from the app lifespan."""
+    from .database import AsyncSessionLocal
+
+    interval = interval or settings.COMPACTION_INTERVAL_SECONDS
+    while True:
+        await asyncio.sleep(interval)
+        try:
+            async with AsyncSessionLocal() as session:
+                result = await compact_leaderboard(
+                    session,
+                    settings.COMPACTION_RETAIN_TOP,
+                    settings.COMPACTION_MIN_AGE_DAYS,
+                    settings.COMPACTION_BATCH_SIZE,
+                )
+            if result.rows:
+                logger.info("Leaderboard compaction archived %d rows (~%d bytes)", result.rows, result.bytes)
+        except Exception:
+            # Keep the loop alive; the next run retries from where this one stopped
+            logger.exception("Leaderboard compaction failed")
+
+async def main():
+    parser = argparse.ArgumentParser(description="Archive leaderboard rows outside every retained ranking")
+    parser.add_argument("--dry-run", action="store_true", help="Only report what would be archived")
+    parser.add_argument("--retain-top", type=int, default=settings.COMPACTION_RETAIN_TOP)
+    parser.add_argument("--min-age-days", type=int, default=settings.COMPACTION_MIN_AGE_DAYS)
+    parser.add_argument("--batch-size", type=int, default=settings.COMPACTION_BATCH_SIZE)
+    args = parser.parse_args()
+    if args.retain_top < 1:
+        parser.error("--retain-top must be at least 1")
+
+    from .database import AsyncSessionLocal, engine
+    from .db_models import Base
+
+    engine.echo = False
+
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+
+    async with AsyncSessionLocal() as session:
+        result = await compact_leaderboard(
+            session, args.retain_top, args.min_age_days, args.batch_size, dry_run=args.dry_run
+        )
+
+    verb = "Would archive" if result.dryRun else "Archived"
+    print(f"{verb} {result.rows} rows (~{result.bytes} bytes) in {result.batches} batches")
+    await engine.dispose()
+
+if __name__ == "__main__":
+    asyncio.run(main())
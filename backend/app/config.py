@@ -1,7 +1,51 @@
+from typing import List
 from pydantic_settings import BaseSettings, SettingsConfigDict
 
 class Settings(BaseSettings):
     DATABASE_URL: str = "sqlite+aiosqlite:///./snake.db"
+
+    # Connection pool: at most DB_POOL_SIZE + DB_MAX_OVERFLOW connections are
+    # open at once, and a request waits for one once they are all checked out.
+    # Ignored for URLs whose pool isn't sized, such as in-memory SQLite.
+    DB_POOL_SIZE: int = 10
+    DB_MAX_OVERFLOW: int = 10
+
+    # Emails allowed to use admin-only endpoints (e.g. leaderboard export/import)
+    ADMIN_EMAILS: List[str] = []
+
+    # Bulk export/import tuning
+    EXPORT_CHUNK_SIZE: int = 1000
+    IMPORT_BATCH_SIZE: int = 1000
+    # Longest single import record; bounds memory on a malformed file (e.g. an unclosed CSV quote)
+    IMPORT_MAX_RECORD_BYTES: int = 65536
+
+    # Admission control for write endpoints (see app/admission.py). Each admitted
+    # request holds a pool connection, so the write limit is capped at the
+    # engine pool's capacity (DB_POOL_SIZE + DB_MAX_OVERFLOW for a queue pool)
+    # - ADMISSION_READ_RESERVED_CONNECTIONS - 2 (the bulk class's limit): reads
+    # and background jobs always find a connection instead of queueing in the
+    # pool behind writes.
+    ADMISSION_ENABLED: bool = True
+    ADMISSION_WRITE_LIMIT: int = 8
+    ADMISSION_WRITE_MAX_LIMIT: int = 14
+    ADMISSION_READ_RESERVED_CONNECTIONS: int = 4
+    ADMISSION_WRITE_QUEUE_SIZE: int = 64
+    ADMISSION_WRITE_TARGET_LATENCY: float = 0.25
+    ADMISSION_QUEUE_TIMEOUT: float = 2.0
+
+    # Leaderboard compaction (see app/compaction.py); interval 0 disables the background job
+    COMPACTION_INTERVAL_SECONDS: int = 3600
+    COMPACTION_RETAIN_TOP: int = 100
+    COMPACTION_MIN_AGE_DAYS: int = 30
+    COMPACTION_BATCH_SIZE: int = 500
+
+    # Signup availability index (see app/availability.py)
+    AVAILABILITY_INDEX_CAPACITY: int = 100_000
+    AVAILABILITY_INDEX_ERROR_RATE: float = 0.01
+
+    # Simulated players to run inside the server for spectate load tests (see app/bots.py)
+    BOT_PLAYERS: int = 0
+    BOT_SUBMIT_SCORES: bool = False
     
     model_config = SettingsConfigDict(env_file=".env")
 
@@ -1,17 +1,40 @@
 from typing import List, Optional
-from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker, AsyncSession
+from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker, AsyncEngine, AsyncSession
 from sqlalchemy.future import select
 from sqlalchemy import update, delete
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.pool import QueuePool
 from .config import settings
+from .availability import availability_index
 from .db_models import User as DBUser, LeaderboardEntry as DBLeaderboardEntry
 from .models import User, LeaderboardEntry, ActivePlayer, GameMode, Position, Direction
 from datetime import datetime, date
 import uuid
 
 # Database Setup
-engine = create_async_engine(settings.DATABASE_URL, echo=True)
+def _create_engine(url: str) -> AsyncEngine:
+    engine = create_async_engine(url, echo=True)
+    # Only queue pools take sizing arguments: in-memory SQLite, for one, gets
+    # a StaticPool (a single shared connection) that rejects them
+    if isinstance(engine.pool, QueuePool):
+        engine = create_async_engine(
+            url,
+            echo=True,
+            pool_size=settings.DB_POOL_SIZE,
+            max_overflow=settings.DB_MAX_OVERFLOW,
+        )
+    return engine
+
+engine = _create_engine(settings.DATABASE_URL)
 AsyncSessionLocal = async_sessionmaker(engine, expire_on_commit=False)
 
+def pool_capacity() -> Optional[int]:
+    """Connections ``engine`` hands out before checkouts wait, or ``None`` if they never do."""
+    pool = engine.pool
+    if isinstance(pool, QueuePool) and pool._max_overflow >= 0:
+        return pool.size() + pool._max_overflow
+    return None
+
 async def get_db():
     async with AsyncSessionLocal() as session:
         yield session
@@ -22,20 +45,20 @@ active_players_store: dict[str, ActivePlayer] = {}
 # CRUD Operations
 
 async def create_user(session: AsyncSession, email: str, username: str, password: str) -> Optional[User]:
-    # Check if user exists
-    stmt = select(DBUser).where((DBUser.email == email) | (DBUser.username == username))
-    result = await session.execute(stmt)
-    if result.scalar_one_or_none():
-        return None
-
     new_user = DBUser(
         email=email,
         username=username,
         password_hash=password, # In real app, hash this!
     )
     session.add(new_user)
-    await session.commit()
+    try:
+        await session.commit()
+    except IntegrityError:
+        # Email or username taken: the unique constraints decide, no pre-check query
+        await session.rollback()
+        return None
     await session.refresh(new_user)
+    availability_index.add(new_user.username, new_user.email)
     
     return User(
         id=new_user.id,
@@ -24,3 +24,14 @@ class LeaderboardEntry(Base):
     score = Column(Integer, index=True)
     mode = Column(SQLEnum(GameMode))
     date = Column(Date, default=date.today)
+
+class LeaderboardArchiveEntry(Base):
+    """Scores moved out of ``leaderboard`` by the compaction job (see app/compaction.py)."""
+    __tablename__ = "leaderboard_archive"
+
+    id = Column(String, primary_key=True)
+    username = Column(String, index=True)
+    score = Column(Integer)
+    mode = Column(SQLEnum(GameMode))
+    date = Column(Date)
+    archived_at = Column(DateTime, default=datetime.now)
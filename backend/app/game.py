@@ -0,0 +1,241 @@
+"""Server-side snake rules, mirroring ``frontend/src/lib/gameLogic.ts``.
+
+Positions are ``(x, y)`` tuples internally; ``to_active_player`` converts a game
+into the API model published to spectators.
+
+Unlike the frontend, food is not placed by rejection sampling. Each ``Game``
+keeps a ``FreeCells`` index of unoccupied cells, updated on every head push and
+tail pop. Placing food is then a single random pick, however full the board is.
+
+Benchmark against rejection sampling at high occupancy:
+    python -m app.game
+"""
+import argparse
+import random
+import time
+from array import array
+from collections import deque
+from datetime import datetime
+from typing import Deque, Optional, Sequence, Tuple
+
+from .models import ActivePlayer, Direction, GameMode, Position
+
+GRID_SIZE = 20
+INITIAL_SPEED = 150
+SPEED_INCREMENT = 5
+MIN_SPEED = 50
+FOOD_SCORE = 10
+
+Cell = Tuple[int, int]
+
+def initial_snake(grid_size: int = GRID_SIZE) -> Tuple[Cell, ...]:
+    """Three cells heading right from the centre; ((10, 10), (9, 10), (8, 10)) on the default board."""
+    centre = grid_size // 2
+    return (centre, centre), (centre - 1, centre), (centre - 2, centre)
+
+DIRECTION_DELTAS = {
+    Direction.UP: (0, -1),
+    Direction.DOWN: (0, 1),
+    Direction.LEFT: (-1, 0),
+    Direction.RIGHT: (1, 0),
+}
+
+OPPOSITE_DIRECTIONS = {
+    Direction.UP: Direction.DOWN,
+    Direction.DOWN: Direction.UP,
+    Direction.LEFT: Direction.RIGHT,
+    Direction.RIGHT: Direction.LEFT,
+}
+
+def is_valid_direction_change(current: Direction, next_direction: Direction) -> bool:
+    return next_direction != OPPOSITE_DIRECTIONS[current]
+
+def calculate_speed(score: int) -> int:
+    """Milliseconds per tick for a given score."""
+    return max(MIN_SPEED, INITIAL_SPEED - (score // 50) * SPEED_INCREMENT)
+
+def next_head(head: Cell, direction: Direction, mode: GameMode, grid_size: int = GRID_SIZE) -> Optional[Cell]:
+    """Cell the head moves into, or ``None`` if it hits a wall."""
+    dx, dy = DIRECTION_DELTAS[direction]
+    x, y = head[0] + dx, head[1] + dy
+    if mode == GameMode.passthrough:
+        return x % grid_size, y % grid_size
+    if 0 <= x < grid_size and 0 <= y < grid_size:
+        return x, y
+    return None
+
+class FreeCells:
+    """Unoccupied cells of a board, with O(1) add, remove, membership and random pick.
+
+    Cells live in a dense array (removal swaps the last cell into the hole),
+    plus a position map from cell number to slot, ``-1`` meaning occupied.
+    Both are flat ``array``s of cell numbers rather than tuples and a dict,
+    which keeps a 20x20 board around 3KB.
+    """
+
+    def __init__(self, grid_size: int):
+        self.grid_size = grid_size
+        size = grid_size * grid_size
+        self._cells = array("i", range(size))
+        self._slots = array("i", range(size))
+
+    def __len__(self) -> int:
+        return len(self._cells)
+
+    def __contains__(self, cell: Cell) -> bool:
+        return self._slots[cell[1] * self.grid_size + cell[0]] >= 0
+
+    def remove(self, cell: Cell):
+        number = cell[1] * self.grid_size + cell[0]
+        slot = self._slots[number]
+        if slot < 0:
+            raise KeyError(cell)
+        last = self._cells.pop()
+        if last != number:
+            self._cells[slot] = last
+            self._slots[last] = slot
+        self._slots[number] = -1
+
+    def add(self, cell: Cell):
+        number = cell[1] * self.grid_size + cell[0]
+        if self._slots[number] >= 0:
+            raise KeyError(cell)
+        self._slots[number] = len(self._cells)
+        self._cells.append(number)
+
+    def choice(self, rng: random.Random) -> Optional[Cell]:
+        if not self._cells:
+            return None
+        return divmod(self._cells[rng.randrange(len(self._cells))], self.grid_size)[::-1]
+
+class Game:
+    def __init__(
+        self,
+        mode: GameMode,
+        grid_size: int = GRID_SIZE,
+        rng: Optional[random.Random] = None,
+        seed: Optional[int] = None,
+        snake: Optional[Sequence[Cell]] = None,
+    ):
+        """``seed`` (or a shared ``rng``) makes food placement, and so a whole replay, deterministic."""
+        self.mode = mode
+        self.grid_size = grid_size
+        self.rng = rng or random.Random(seed)
+        self.snake: Deque[Cell] = deque(snake or initial_snake(grid_size))
+        self.free = FreeCells(grid_size)
+        for cell in self.snake:
+            self.free.remove(cell)
+        self.direction = Direction.RIGHT
+        self.score = 0
+        self.is_game_over = False
+        self.started_at = datetime.now()
+        self.food = self.generate_food()
+
+    @property
+    def head(self) -> Cell:
+        return self.snake[0]
+
+    @property
+    def speed(self) -> int:
+        return calculate_speed(self.score)
+
+    def generate_food(self) -> Optional[Cell]:
+        """Random free cell, or ``None`` when the snake fills the board."""
+        return self.free.choice(self.rng)
+
+    def is_deadly(self, cell: Optional[Cell]) -> bool:
+        """Whether moving the head into ``cell`` ends the game."""
+        if cell is None:
+            return True
+        # The tail moves out of the way this tick (food is never on the snake,
+        # so a growing move can't land on the tail either)
+        return cell not in self.free and cell != self.snake[-1]
+
+    def change_direction(self, direction: Direction):
+        if is_valid_direction_change(self.direction, direction):
+            self.direction = direction
+
+    def step(self):
+        if self.is_game_over:
+            return
+
+        head = next_head(self.head, self.direction, self.mode, self.grid_size)
+        if self.is_deadly(head):
+            self.is_game_over = True
+            return
+
+        ate = head == self.food
+        if not ate:
+            self.free.add(self.snake.pop())
+        self.snake.appendleft(head)
+        self.free.remove(head)
+
+        if ate:
+            self.score += FOOD_SCORE
+            self.food = self.generate_food()
+            if self.food is None:
+                # Board is full: nothing left to eat, the game is won
+                self.is_game_over = True
+
+def to_active_player(player_id: str, username: str, game: Game) -> ActivePlayer:
+    food = game.food or game.head
+    return ActivePlayer(
+        id=player_id,
+        username=username,
+        score=game.score,
+        mode=game.mode,
+        snake=[Position(x=x, y=y) for x, y in game.snake],
+        food=Position(x=food[0], y=food[1]),
+        direction=game.direction,
+        startedAt=game.started_at,
+    )
+
+# Benchmark
+
+def _rejection_sample(occupied: set, grid_size: int, rng: random.Random) -> Cell:
+    # What the frontend's generateFood does
+    while True:
+        food = (rng.randrange(grid_size), rng.randrange(grid_size))
+        if food not in occupied:
+            return food
+
+def benchmark(grid_size: int, occupancy: float, samples: int, seed: int = 0) -> dict:
+    rng = random.Random(seed)
+    cells = [(x, y) for y in range(grid_size) for x in range(grid_size)]
+    occupied = set(rng.sample(cells, min(len(cells) - 1, round(len(cells) * occupancy))))
+    free = FreeCells(grid_size)
+    for cell in occupied:
+        free.remove(cell)
+
+    started = time.perf_counter()
+    for _ in range(samples):
+        free.choice(rng)
+    indexed = time.perf_counter() - started
+
+    started = time.perf_counter()
+    for _ in range(samples):
+        _rejection_sample(occupied, grid_size, rng)
+    rejection = time.perf_counter() - started
+
+    return {
+        "grid_size": grid_size,
+        "occupancy": round(len(occupied) / len(cells), 4),
+        "free_cells_us": round(indexed / samples * 1e6, 3),
+        "rejection_us": round(rejection / samples * 1e6, 3),
+    }
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark food placement at high board occupancy")
+    parser.add_argument("--grid-sizes", default="20,100,500")
+    parser.add_argument("--occupancy", default="0.5,0.9,0.99,0.999")
+    parser.add_argument("--samples", type=int, default=2000)
+    args = parser.parse_args()
+
+    print(f"{'grid':>6} {'occupancy':>10} {'free cells (us)':>16} {'rejection (us)':>15}")
+    for grid_size in map(int, args.grid_sizes.split(",")):
+        for occupancy in map(float, args.occupancy.split(",")):
+            r = benchmark(grid_size, occupancy, args.samples)
+            print(f"{r['grid_size']:>6} {r['occupancy']:>10} {r['free_cells_us']:>16} {r['rejection_us']:>15}")
+
+if __name__ == "__main__":
+    main()
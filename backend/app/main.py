@@ -1,8 +1,14 @@
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 from contextlib import asynccontextmanager
-from .routers import auth, leaderboard, players
-from .database import engine
+import asyncio
+from .routers import auth, leaderboard, players, metrics
+from .database import engine, AsyncSessionLocal
+from .availability import availability_index
+from .admission import AdmissionControlMiddleware
+from .compaction import run_compaction_forever
+from .bots import BotSwarm
+from .config import settings
 from .db_models import Base
 
 @asynccontextmanager
@@ -10,8 +16,26 @@ async def lifespan(app: FastAPI):
     # Create tables on startup
     async with engine.begin() as conn:
         await conn.run_sync(Base.metadata.create_all)
+
+    async with AsyncSessionLocal() as session:
+        await availability_index.load(session)
+
+    tasks = []
+    if settings.COMPACTION_INTERVAL_SECONDS > 0:
+        tasks.append(asyncio.create_task(run_compaction_forever()))
+    if settings.BOT_PLAYERS > 0:
+        tasks.append(asyncio.create_task(
+            BotSwarm(settings.BOT_PLAYERS, submit_scores=settings.BOT_SUBMIT_SCORES).run()
+        ))
+
     yield
 
+    # Wait for the background tasks to unwind (the swarm removes its players
+    # and finishes pending score submissions) before the engine goes away
+    for task in tasks:
+        task.cancel()
+    await asyncio.gather(*tasks, return_exceptions=True)
+
 app = FastAPI(
     title="Snake Spectacle API",
     description="Backend API for the Snake Spectacle game",
@@ -19,6 +43,10 @@ app = FastAPI(
     lifespan=lifespan
 )
 
+# Shed load on write endpoints before it reaches the DB pool.
+# Added before CORS so that CORS stays outermost and 503s still carry CORS headers.
+app.add_middleware(AdmissionControlMiddleware)
+
 # Configure CORS
 app.add_middleware(
     CORSMiddleware,
@@ -32,6 +60,7 @@ app.add_middleware(
 app.include_router(auth.router, prefix="/api")
 app.include_router(leaderboard.router, prefix="/api")
 app.include_router(players.router, prefix="/api")
+app.include_router(metrics.router, prefix="/api")
 
 # Serve Frontend
 from fastapi.staticfiles import StaticFiles
@@ -2,6 +2,7 @@ from enum import Enum
 from typing import List, Optional, Generic, TypeVar
 from pydantic import BaseModel, EmailStr, Field
 from datetime import datetime, date
+import datetime as dt
 
 T = TypeVar('T')
 
@@ -9,6 +10,10 @@ class GameMode(str, Enum):
     passthrough = "passthrough"
     walls = "walls"
 
+class ExportFormat(str, Enum):
+    ndjson = "ndjson"
+    csv = "csv"
+
 class Direction(str, Enum):
     UP = "UP"
     DOWN = "DOWN"
@@ -50,6 +55,30 @@ class ApiResponse(BaseModel, Generic[T]):
 class AuthResponse(ApiResponse[User]):
     user: Optional[User] = None
 
+class Availability(BaseModel):
+    username: Optional[bool] = None
+    email: Optional[bool] = None
+
+class ImportResult(BaseModel):
+    imported: int
+    batches: int
+
+class CompactionResult(BaseModel):
+    rows: int
+    bytes: int
+    batches: int
+    dryRun: bool
+
+class LimiterStats(BaseModel):
+    name: str
+    limit: int
+    inFlight: int
+    queued: int
+    maxQueue: int
+    admitted: int
+    rejected: int
+    avgLatencyMs: float
+
 # Request Models
 class LoginRequest(BaseModel):
     email: EmailStr
@@ -63,3 +92,13 @@ class SignupRequest(BaseModel):
 class ScoreSubmission(BaseModel):
     score: int
     mode: GameMode
+
+class ImportRecord(BaseModel):
+    """One row of a leaderboard import file; ``id`` and ``date`` are generated when missing."""
+    id: Optional[str] = None
+    username: str
+    # Fits the INTEGER column (int4 on PostgreSQL)
+    score: int = Field(ge=0, le=2**31 - 1)
+    mode: GameMode
+    # Qualified: with a default, a bare ``date`` here would resolve to the field itself
+    date: Optional[dt.date] = None
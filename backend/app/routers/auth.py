@@ -1,9 +1,12 @@
 from fastapi import APIRouter, HTTPException, Depends, status
 from fastapi.security import OAuth2PasswordBearer
-from typing import Annotated
+from pydantic import EmailStr
+from typing import Annotated, Optional
 from sqlalchemy.ext.asyncio import AsyncSession
-from ..models import LoginRequest, SignupRequest, AuthResponse, User, ApiResponse
+from ..models import LoginRequest, SignupRequest, AuthResponse, User, ApiResponse, Availability
+from ..availability import availability_index
 from ..database import get_db, create_user, get_user_by_email, verify_password
+from ..config import settings
 
 router = APIRouter(prefix="/auth", tags=["auth"])
 
@@ -24,6 +27,14 @@ async def get_current_user(
         )
     return user
 
+async def get_admin_user(current_user: Annotated[User, Depends(get_current_user)]):
+    if current_user.email not in settings.ADMIN_EMAILS:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Admin privileges required",
+        )
+    return current_user
+
 @router.post("/login", response_model=AuthResponse)
 async def login(request: LoginRequest, session: AsyncSession = Depends(get_db)):
     if not await verify_password(session, request.email, request.password):
@@ -43,6 +54,23 @@ async def signup(request: SignupRequest, session: AsyncSession = Depends(get_db)
     
     return AuthResponse(success=True, user=user)
 
+@router.get("/available", response_model=ApiResponse[Availability])
+async def available(
+    username: Optional[str] = None,
+    email: Optional[EmailStr] = None,
+    session: AsyncSession = Depends(get_db)
+):
+    # Answered from the in-memory index; the DB is only hit to confirm a possible match
+    if username is None and email is None:
+        return ApiResponse(success=False, error="Provide a username or email")
+
+    availability = Availability()
+    if username is not None:
+        availability.username = await availability_index.is_username_available(session, username)
+    if email is not None:
+        availability.email = await availability_index.is_email_available(session, email)
+    return ApiResponse(success=True, data=availability)
+
 @router.post("/logout", response_model=ApiResponse[None])
 async def logout(current_user: Annotated[User, Depends(get_current_user)]):
     return ApiResponse(success=True)
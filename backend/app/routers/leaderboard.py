@@ -1,9 +1,12 @@
-from fastapi import APIRouter, Depends, Query
+from fastapi import APIRouter, Depends, Query, Request
+from fastapi.responses import StreamingResponse
 from typing import List, Optional, Annotated
 from sqlalchemy.ext.asyncio import AsyncSession
-from ..models import LeaderboardEntry, GameMode, ApiResponse, ScoreSubmission, User
+from ..models import LeaderboardEntry, GameMode, ApiResponse, ScoreSubmission, User, ExportFormat, ImportResult
+from ..config import settings
 from ..database import get_db, get_leaderboard as db_get_leaderboard, add_score
-from .auth import get_current_user
+from ..bulk import MEDIA_TYPES, BulkImportError, export_leaderboard as bulk_export, import_leaderboard as bulk_import
+from .auth import get_current_user, get_admin_user
 
 router = APIRouter(prefix="/leaderboard", tags=["leaderboard"])
 
@@ -23,3 +26,30 @@ async def submit_score(
 ):
     entry = await add_score(session, current_user.username, submission.score, submission.mode)
     return ApiResponse(success=True, data=entry)
+
+@router.get("/export")
+async def export_leaderboard(
+    admin: Annotated[User, Depends(get_admin_user)],
+    format: ExportFormat = ExportFormat.ndjson,
+    session: AsyncSession = Depends(get_db)
+):
+    return StreamingResponse(
+        bulk_export(session, format, settings.EXPORT_CHUNK_SIZE),
+        media_type=MEDIA_TYPES[format],
+        headers={"Content-Disposition": f'attachment; filename="leaderboard.{format.value}"'},
+    )
+
+@router.post("/import", response_model=ApiResponse[ImportResult])
+async def import_leaderboard(
+    request: Request,
+    admin: Annotated[User, Depends(get_admin_user)],
+    format: ExportFormat = ExportFormat.ndjson,
+    session: AsyncSession = Depends(get_db)
+):
+    # The body is consumed as a stream, so large files are never held in memory
+    try:
+        result = await bulk_import(session, request.stream(), format, settings.IMPORT_BATCH_SIZE)
+    except BulkImportError as e:
+        # Earlier batches are committed: report how far the import got
+        return ApiResponse(success=False, error=str(e), data=e.result)
+    return ApiResponse(success=True, data=result)
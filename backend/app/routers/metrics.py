@@ -0,0 +1,10 @@
+from fastapi import APIRouter
+from typing import List
+from ..models import ApiResponse, LimiterStats
+from ..admission import limiters
+
+router = APIRouter(prefix="/metrics", tags=["metrics"])
+
+@router.get("/admission", response_model=ApiResponse[List[LimiterStats]])
+async def get_admission_metrics():
+    return ApiResponse(success=True, data=[limiter.stats() for limiter in limiters.values()])
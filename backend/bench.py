@@ -0,0 +1,274 @@
+"""Load test / benchmark harness for the API.
+
+Drives the real app either in-process (through httpx's ASGITransport, no
+server needed) or over HTTP against a running server. Runs a weighted mix of
+scenarios from concurrent virtual users. Samples taken during the warmup are
+discarded. Prints throughput and latency percentiles per operation as JSON.
+
+Examples:
+    python bench.py --in-process --duration 20 --concurrency 50
+    python bench.py --base-url http://localhost:8000 --mix leaderboard_read=10,score_burst=1
+    python bench.py --in-process --output after.json --compare before.json
+"""
+import argparse
+import asyncio
+import json
+import math
+import os
+import random
+import subprocess
+import sys
+import time
+from collections import defaultdict
+from datetime import datetime
+from typing import Awaitable, Callable, Dict, List, Optional
+
+import httpx
+
+from verify_api import BASE_URL, generate_random_string
+
+DEFAULT_MIX = "signup_login=1,score_burst=2,leaderboard_read=10,spectate_poll=5"
+SCORE_BURST_SIZE = 5
+
+# Histogram bucket upper bounds in milliseconds
+HISTOGRAM_BUCKETS_MS = [1, 2, 5, 10, 20, 50, 100, 200, 500, 1000, 2000, 5000]
+
+class Recorder:
+    def __init__(self):
+        self.latencies: Dict[str, List[float]] = defaultdict(list)
+        self.errors: Dict[str, int] = defaultdict(int)
+        self.shed: Dict[str, int] = defaultdict(int)
+        # Only requests started at or after this point are counted
+        self.measure_from = float("inf")
+
+    async def request(self, client: httpx.AsyncClient, name: str, method: str, url: str, **kwargs) -> Optional[httpx.Response]:
+        started = time.perf_counter()
+        try:
+            response = await client.request(method, url, **kwargs)
+        except httpx.HTTPError:
+            response = None
+        elapsed = time.perf_counter() - started
+
+        if started >= self.measure_from:
+            self.latencies[name].append(elapsed)
+            if response is None or response.status_code >= 400:
+                self.errors[name] += 1
+            if response is not None and response.status_code == 503:
+                self.shed[name] += 1
+        return response
+
+class VirtualUser:
+    def __init__(self, client: httpx.AsyncClient, recorder: Recorder, rng: random.Random):
+        self.client = client
+        self.recorder = recorder
+        self.rng = rng
+        self.headers: Dict[str, str] = {}
+
+    async def signup(self) -> Optional[str]:
+        username = f"bench_{generate_random_string(12)}"
+        email = f"{username}@example.com"
+        response = await self.recorder.request(self.client, "signup", "POST", "/api/auth/signup", json={
+            "email": email,
+            "username": username,
+            "password": "password123"
+        })
+        if response is not None and response.status_code == 201 and response.json()["success"]:
+            return email
+        return None
+
+    async def setup(self):
+        email = await self.signup()
+        if email:
+            # Like the frontend, the email doubles as the bearer token
+            self.headers = {"Authorization": f"Bearer {email}"}
+
+    # Scenarios
+
+    async def signup_login(self):
+        email = await self.signup()
+        if email:
+            await self.recorder.request(self.client, "login", "POST", "/api/auth/login", json={
+                "email": email,
+                "password": "password123"
+            })
+
+    async def score_burst(self):
+        for _ in range(SCORE_BURST_SIZE):
+            await self.recorder.request(self.client, "submit_score", "POST", "/api/leaderboard", json={
+                "score": self.rng.randrange(0, 5000, 10),
+                "mode": self.rng.choice(["walls", "passthrough"])
+            }, headers=self.headers)
+
+    async def leaderboard_read(self):
+        mode = self.rng.choice([None, "walls", "passthrough"])
+        params = {"mode": mode} if mode else None
+        await self.recorder.request(self.client, "get_leaderboard", "GET", "/api/leaderboard", params=params)
+
+    async def spectate_poll(self):
+        response = await self.recorder.request(self.client, "list_players", "GET", "/api/players")
+        if response is not None and response.status_code == 200:
+            players = response.json()["data"] or []
+            if players:
+                player_id = self.rng.choice(players)["id"]
+                await self.recorder.request(self.client, "get_player", "GET", f"/api/players/{player_id}")
+
+SCENARIOS: Dict[str, Callable[[VirtualUser], Awaitable[None]]] = {
+    "signup_login": VirtualUser.signup_login,
+    "score_burst": VirtualUser.score_burst,
+    "leaderboard_read": VirtualUser.leaderboard_read,
+    "spectate_poll": VirtualUser.spectate_poll,
+}
+
+def parse_mix(mix: str) -> Dict[str, float]:
+    weights = {}
+    for part in mix.split(","):
+        name, _, weight = part.partition("=")
+        name = name.strip()
+        if name not in SCENARIOS:
+            raise ValueError(f"Unknown scenario {name!r}, expected one of {sorted(SCENARIOS)}")
+        weights[name] = float(weight or 1)
+    return weights
+
+def percentile(sorted_values: List[float], pct: float) -> float:
+    # Nearest-rank percentile
+    index = max(0, min(len(sorted_values) - 1, math.ceil(pct / 100 * len(sorted_values)) - 1))
+    return sorted_values[index]
+
+def summarize(latencies: List[float], errors: int, shed: int, duration: float) -> dict:
+    values = sorted(latency * 1000 for latency in latencies)
+    histogram = {f"le_{bound}ms": 0 for bound in HISTOGRAM_BUCKETS_MS}
+    histogram["inf"] = 0
+    for value in values:
+        for bound in HISTOGRAM_BUCKETS_MS:
+            if value <= bound:
+                histogram[f"le_{bound}ms"] += 1
+                break
+        else:
+            histogram["inf"] += 1
+
+    return {
+        "requests": len(values),
+        "errors": errors,
+        "shed": shed,
+        "throughput_rps": round(len(values) / duration, 2),
+        "latency_ms": {
+            "min": round(values[0], 3),
+            "mean": round(sum(values) / len(values), 3),
+            "p50": round(percentile(values, 50), 3),
+            "p95": round(percentile(values, 95), 3),
+            "p99": round(percentile(values, 99), 3),
+            "max": round(values[-1], 3),
+        },
+        "histogram": histogram,
+    }
+
+def git_commit() -> Optional[str]:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+async def make_client(args) -> httpx.AsyncClient:
+    if not args.in_process:
+        return httpx.AsyncClient(base_url=args.base_url, timeout=args.timeout)
+
+    from app.main import app
+    from app.database import engine
+    from app.db_models import Base
+
+    # SQL echo would swamp the report; ASGITransport does not run the
+    # lifespan, so create the tables here
+    engine.echo = False
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+    return httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://bench", timeout=args.timeout)
+
+async def run(args) -> dict:
+    weights = parse_mix(args.mix)
+    names = list(weights)
+    recorder = Recorder()
+    client = await make_client(args)
+
+    async with client:
+        users = [VirtualUser(client, recorder, random.Random(args.seed + i)) for i in range(args.concurrency)]
+        await asyncio.gather(*(user.setup() for user in users))
+
+        recorder.measure_from = time.perf_counter() + args.warmup
+        deadline = recorder.measure_from + args.duration
+
+        async def worker(user: VirtualUser):
+            while time.perf_counter() < deadline:
+                scenario = user.rng.choices(names, weights=[weights[n] for n in names])[0]
+                await SCENARIOS[scenario](user)
+
+        await asyncio.gather(*(worker(user) for user in users))
+
+    all_latencies = [latency for values in recorder.latencies.values() for latency in values]
+    if not all_latencies:
+        raise RuntimeError("No requests completed during the measured window")
+
+    return {
+        "commit": git_commit(),
+        "timestamp": datetime.now().isoformat(timespec="seconds"),
+        "config": {
+            "target": "in-process" if args.in_process else args.base_url,
+            "concurrency": args.concurrency,
+            "warmup_s": args.warmup,
+            "duration_s": args.duration,
+            "mix": weights,
+            "seed": args.seed,
+        },
+        "total": summarize(all_latencies, sum(recorder.errors.values()), sum(recorder.shed.values()), args.duration),
+        "operations": {
+            name: summarize(values, recorder.errors[name], recorder.shed[name], args.duration)
+            for name, values in sorted(recorder.latencies.items())
+        },
+    }
+
+def compare(report: dict, baseline: dict):
+    print(f"Comparison against {baseline.get('commit') or 'baseline'}:", file=sys.stderr)
+    for name in ["total", *report["operations"]]:
+        current = report["total"] if name == "total" else report["operations"][name]
+        previous = baseline["total"] if name == "total" else baseline["operations"].get(name)
+        if not previous:
+            continue
+        rps_delta = (current["throughput_rps"] / previous["throughput_rps"] - 1) * 100
+        p99_delta = (current["latency_ms"]["p99"] / previous["latency_ms"]["p99"] - 1) * 100
+        print(f"  {name:<16} throughput {rps_delta:+6.1f}%   p99 {p99_delta:+6.1f}%", file=sys.stderr)
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the Snake Spectacle API")
+    target = parser.add_mutually_exclusive_group()
+    target.add_argument("--in-process", action="store_true", help="Drive the app through ASGITransport (uses DATABASE_URL)")
+    target.add_argument("--base-url", default=BASE_URL, help="Server to benchmark over HTTP")
+    parser.add_argument("--concurrency", type=int, default=20, help="Number of virtual users")
+    parser.add_argument("--warmup", type=float, default=5.0, help="Seconds of load before measuring")
+    parser.add_argument("--duration", type=float, default=30.0, help="Seconds to measure")
+    parser.add_argument("--mix", default=DEFAULT_MIX, help="Weighted scenarios, e.g. leaderboard_read=10,score_burst=1")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--timeout", type=float, default=10.0, help="Per-request timeout in seconds")
+    parser.add_argument("--output", help="Write the JSON report here instead of stdout")
+    parser.add_argument("--compare", help="Previous JSON report to diff against")
+    args = parser.parse_args()
+
+    if args.in_process:
+        # Keep benchmark data out of the development database unless told otherwise
+        os.environ.setdefault("DATABASE_URL", "sqlite+aiosqlite:///./bench.db")
+
+    report = asyncio.run(run(args))
+
+    output = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, "w") as f:
+            f.write(output + "\n")
+    else:
+        print(output)
+
+    if args.compare:
+        with open(args.compare) as f:
+            compare(report, json.load(f))
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,128 @@
+"""Shared test fixtures for ``tests`` and ``tests_integration``.
+
+The schema is created once per test session and per database backend. Each
+test runs inside an outer transaction on a single connection, and that
+transaction is rolled back afterwards. Session commits made by the app only
+release SAVEPOINTs inside it (``join_transaction_mode="create_savepoint"``),
+so nothing a test writes survives it, and no test pays for ``create_all`` or
+``drop_all``.
+
+DB tests run against in-memory SQLite and PostgreSQL. PostgreSQL comes from
+``TEST_POSTGRES_URL`` when set. Otherwise a throwaway cluster is started when
+``initdb``/``pg_ctl`` are on PATH. Failing both, or if the cluster can't be
+started (``initdb`` refuses to run as root, for one), the PostgreSQL variants
+are skipped.
+"""
+import os
+import shutil
+import socket
+import subprocess
+from typing import AsyncGenerator, Generator, Optional
+
+import pytest
+import pytest_asyncio
+from httpx import AsyncClient, ASGITransport
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession, create_async_engine
+from sqlalchemy.pool import StaticPool
+
+from app.main import app
+from app.database import get_db, active_players_store
+from app.db_models import Base
+
+SQLITE_URL = "sqlite+aiosqlite:///:memory:"
+
+def _free_port() -> int:
+    with socket.socket() as s:
+        s.bind(("localhost", 0))
+        return s.getsockname()[1]
+
+@pytest.fixture(scope="session")
+def postgres_url(tmp_path_factory) -> Generator[Optional[str], None, None]:
+    if url := os.environ.get("TEST_POSTGRES_URL"):
+        yield url
+        return
+
+    initdb, pg_ctl = shutil.which("initdb"), shutil.which("pg_ctl")
+    if not (initdb and pg_ctl):
+        yield None
+        return
+
+    data = tmp_path_factory.mktemp("pgdata")
+    port = _free_port()
+    try:
+        subprocess.run([initdb, "-D", str(data), "-U", "postgres", "-A", "trust"], check=True, capture_output=True)
+        # -F: no fsync, this cluster is thrown away after the run
+        subprocess.run([
+            pg_ctl, "-D", str(data), "-l", str(data / "server.log"), "-w", "start",
+            "-o", f"-F -p {port} -k {data} -c listen_addresses=localhost",
+        ], check=True, capture_output=True)
+    except subprocess.CalledProcessError as e:
+        stderr = e.stderr.decode(errors="replace").strip() if e.stderr else ""
+        pytest.skip(f"Could not start a PostgreSQL cluster: {stderr or e}")
+    except OSError as e:
+        pytest.skip(f"Could not start a PostgreSQL cluster: {e}")
+    try:
+        yield f"postgresql+asyncpg://postgres@localhost:{port}/postgres"
+    finally:
+        subprocess.run([pg_ctl, "-D", str(data), "-m", "immediate", "stop"], capture_output=True)
+
+def _sqlite_engine() -> AsyncEngine:
+    # One shared connection, otherwise every checkout gets its own empty :memory: DB
+    engine = create_async_engine(SQLITE_URL, poolclass=StaticPool)
+
+    # pysqlite's own transaction handling breaks SAVEPOINT; let SQLAlchemy emit BEGIN
+    @event.listens_for(engine.sync_engine, "connect")
+    def do_connect(dbapi_connection, connection_record):
+        dbapi_connection.isolation_level = None
+
+    @event.listens_for(engine.sync_engine, "begin")
+    def do_begin(conn):
+        conn.exec_driver_sql("BEGIN")
+
+    return engine
+
+@pytest_asyncio.fixture(scope="session", params=["sqlite", "postgresql"])
+async def engine(request) -> AsyncGenerator[AsyncEngine, None]:
+    if request.param == "sqlite":
+        engine = _sqlite_engine()
+    else:
+        url = request.getfixturevalue("postgres_url")
+        if not url:
+            pytest.skip("PostgreSQL not available: set TEST_POSTGRES_URL or put initdb/pg_ctl on PATH")
+        engine = create_async_engine(url)
+
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.drop_all)
+        await conn.run_sync(Base.metadata.create_all)
+
+    yield engine
+
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.drop_all)
+    await engine.dispose()
+
+@pytest_asyncio.fixture
+async def test_db(engine: AsyncEngine) -> AsyncGenerator[AsyncSession, None]:
+    async with engine.connect() as connection:
+        transaction = await connection.begin()
+        session = AsyncSession(bind=connection, expire_on_commit=False, join_transaction_mode="create_savepoint")
+        try:
+            yield session
+        finally:
+            await session.close()
+            await transaction.rollback()
+
+@pytest_asyncio.fixture
+async def client(test_db: AsyncSession) -> AsyncGenerator[AsyncClient, None]:
+    # Override dependency
+    async def override_get_db():
+        yield test_db
+
+    app.dependency_overrides[get_db] = override_get_db
+
+    async with AsyncClient(transport=ASGITransport(app=app), base_url="http://test/api") as ac:
+        yield ac
+
+    app.dependency_overrides.clear()
+    active_players_store.clear()
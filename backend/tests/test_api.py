@@ -1,26 +1,37 @@
 import pytest
-from fastapi.testclient import TestClient
-from app.main import app
-from app.database import db
+from datetime import datetime
+from httpx import AsyncClient
+from app.database import update_player
+from app.models import ActivePlayer, Direction, GameMode, Position
 
-client = TestClient(app)
+# End-to-end smoke test of the API surface. Uses the shared fixtures from the
+# top-level conftest.py, so every test starts from an empty database.
 
-# Reset DB before tests if needed, but for now we rely on fresh start or unique data
-# Since tests run in same process with TestClient, the global 'db' instance persists.
-# We should probably reset it or use unique emails.
+DEMO_EMAIL = "demo@snake.game"
+DEMO_HEADERS = {"Authorization": f"Bearer {DEMO_EMAIL}"}
 
-def test_root():
-    response = client.get("/")
+async def signup_demo(client: AsyncClient):
+    await client.post("/auth/signup", json={
+        "email": DEMO_EMAIL,
+        "username": "DemoPlayer",
+        "password": "password123"
+    })
+
+@pytest.mark.asyncio
+async def test_root(client: AsyncClient):
+    # Absolute URL: relative to base_url this would be /api/ with a trailing slash
+    response = await client.get("http://test/api")
     assert response.status_code == 200
     assert response.json() == {"message": "Snake Spectacle API is running"}
 
-def test_signup_login_flow():
+@pytest.mark.asyncio
+async def test_signup_login_flow(client: AsyncClient):
     email = "test@example.com"
     username = "TestUser"
     password = "password123"
 
     # Signup
-    response = client.post("/auth/signup", json={
+    response = await client.post("/auth/signup", json={
         "email": email,
         "username": username,
         "password": password
@@ -32,7 +43,7 @@ def test_signup_login_flow():
     assert data["user"]["username"] == username
 
     # Login
-    response = client.post("/auth/login", json={
+    response = await client.post("/auth/login", json={
         "email": email,
         "password": password
     })
@@ -42,37 +53,36 @@ def test_signup_login_flow():
     assert data["user"]["email"] == email
 
     # Login invalid
-    response = client.post("/auth/login", json={
+    response = await client.post("/auth/login", json={
         "email": email,
         "password": "wrongpassword"
     })
     assert response.status_code == 200
     assert response.json()["success"] is False
 
-def test_get_me():
-    # Use demo user
-    token = "demo@snake.game"
-    headers = {"Authorization": f"Bearer {token}"}
-    
-    response = client.get("/auth/me", headers=headers)
+@pytest.mark.asyncio
+async def test_get_me(client: AsyncClient):
+    await signup_demo(client)
+
+    response = await client.get("/auth/me", headers=DEMO_HEADERS)
     assert response.status_code == 200
     data = response.json()
     assert data["success"] is True
-    assert data["data"]["email"] == token
+    assert data["data"]["email"] == DEMO_EMAIL
 
-def test_leaderboard():
-    response = client.get("/leaderboard")
+@pytest.mark.asyncio
+async def test_leaderboard(client: AsyncClient):
+    await signup_demo(client)
+
+    response = await client.get("/leaderboard")
     assert response.status_code == 200
     data = response.json()
     assert data["success"] is True
-    assert len(data["data"]) > 0
+    assert data["data"] == []
 
     # Submit score
-    token = "demo@snake.game"
-    headers = {"Authorization": f"Bearer {token}"}
     score_data = {"score": 9999, "mode": "walls"}
-    
-    response = client.post("/leaderboard", json=score_data, headers=headers)
+    response = await client.post("/leaderboard", json=score_data, headers=DEMO_HEADERS)
     assert response.status_code == 201
     data = response.json()
     assert data["success"] is True
@@ -80,21 +90,33 @@ def test_leaderboard():
     assert data["data"]["username"] == "DemoPlayer"
 
     # Verify in leaderboard
-    response = client.get("/leaderboard?mode=walls")
+    response = await client.get("/leaderboard?mode=walls")
     data = response.json()
     top_score = data["data"][0]
     assert top_score["score"] == 9999
 
-def test_active_players():
-    response = client.get("/players")
+@pytest.mark.asyncio
+async def test_active_players(client: AsyncClient):
+    update_player(ActivePlayer(
+        id="player-1",
+        username="Spectated",
+        score=30,
+        mode=GameMode.passthrough,
+        snake=[Position(x=5, y=5), Position(x=4, y=5)],
+        food=Position(x=10, y=10),
+        direction=Direction.RIGHT,
+        startedAt=datetime.now(),
+    ))
+
+    response = await client.get("/players")
     assert response.status_code == 200
     data = response.json()
     assert data["success"] is True
     players = data["data"]
     assert len(players) > 0
-    
+
     player_id = players[0]["id"]
-    response = client.get(f"/players/{player_id}")
+    response = await client.get(f"/players/{player_id}")
     assert response.status_code == 200
     data = response.json()
     assert data["success"] is True
@@ -0,0 +1,36 @@
+import pytest
+from bench import SCENARIOS, parse_mix, percentile, summarize
+
+def test_percentile_nearest_rank():
+    assert percentile([1, 2, 3, 4, 5], 50) == 3
+    values = list(range(1, 151))
+    assert percentile(values, 50) == 75
+    assert percentile(values, 95) == 143
+    assert percentile(values, 99) == 149
+    assert percentile(values, 100) == 150
+    assert percentile([7], 99) == 7
+
+def test_parse_mix():
+    assert parse_mix("leaderboard_read=10,score_burst=1") == {"leaderboard_read": 10.0, "score_burst": 1.0}
+    # Weight defaults to 1
+    assert parse_mix("spectate_poll") == {"spectate_poll": 1.0}
+    assert set(parse_mix(",".join(SCENARIOS))) == set(SCENARIOS)
+
+def test_parse_mix_unknown_scenario():
+    with pytest.raises(ValueError, match="Unknown scenario 'nope'"):
+        parse_mix("leaderboard_read=1,nope=2")
+
+def test_summarize_histogram_buckets():
+    # Latencies in seconds: 0.5ms, 1ms (inclusive bound), 1.5ms, 30ms, 6s
+    summary = summarize([0.0005, 0.001, 0.0015, 0.03, 6.0], errors=1, shed=0, duration=2.0)
+    assert summary["requests"] == 5
+    assert summary["errors"] == 1
+    assert summary["throughput_rps"] == 2.5
+    histogram = summary["histogram"]
+    assert histogram["le_1ms"] == 2
+    assert histogram["le_2ms"] == 1
+    assert histogram["le_50ms"] == 1
+    assert histogram["inf"] == 1
+    assert sum(histogram.values()) == 5
+    assert summary["latency_ms"]["p50"] == 1.5
+    assert summary["latency_ms"]["max"] == 6000.0
@@ -0,0 +1,115 @@
+import random
+import pytest
+from app.game import FreeCells, Game, calculate_speed, next_head
+from app.models import Direction, GameMode
+
+def test_next_head_walls_and_passthrough():
+    assert next_head((19, 5), Direction.RIGHT, GameMode.walls) is None
+    assert next_head((19, 5), Direction.RIGHT, GameMode.passthrough) == (0, 5)
+    assert next_head((3, 0), Direction.UP, GameMode.passthrough) == (3, 19)
+    assert next_head((3, 4), Direction.DOWN, GameMode.walls) == (3, 5)
+
+def test_initial_state_matches_frontend():
+    game = Game(GameMode.walls, rng=random.Random(1))
+    assert list(game.snake) == [(10, 10), (9, 10), (8, 10)]
+    assert game.direction == Direction.RIGHT
+    assert game.food not in game.snake
+    assert game.speed == 150
+
+def test_step_moves_and_grows():
+    game = Game(GameMode.walls, rng=random.Random(1))
+    game.food = (11, 10)
+
+    game.step()
+    assert list(game.snake) == [(11, 10), (10, 10), (9, 10), (8, 10)]
+    assert game.score == 10
+    assert game.food not in game.snake
+
+    game.food = (0, 0)
+    game.step()
+    assert list(game.snake) == [(12, 10), (11, 10), (10, 10), (9, 10)]
+
+def test_reverse_direction_is_ignored():
+    game = Game(GameMode.walls)
+    game.change_direction(Direction.LEFT)
+    assert game.direction == Direction.RIGHT
+
+def test_wall_and_self_collision_end_the_game():
+    game = Game(GameMode.walls, snake=[(19, 0), (18, 0), (17, 0)])
+    game.step()
+    assert game.is_game_over
+
+    game = Game(GameMode.passthrough, snake=[(5, 5), (6, 5), (6, 6), (5, 6), (4, 6)])
+    game.food = (0, 0)
+    game.direction = Direction.DOWN
+    game.step()
+    assert game.is_game_over
+
+def test_moving_into_the_tail_is_allowed():
+    game = Game(GameMode.walls, snake=[(5, 5), (6, 5), (6, 6), (5, 6)])
+    game.food = (0, 0)
+    game.direction = Direction.DOWN
+    game.step()
+    assert not game.is_game_over
+    assert game.head == (5, 6)
+
+def test_full_board_has_no_food():
+    game = Game(GameMode.walls, grid_size=2, snake=[(0, 0), (1, 0), (1, 1), (0, 1)])
+    assert game.food is None
+    assert game.generate_food() is None
+
+def test_filling_the_board_ends_the_game():
+    # One free cell left, and the snake is about to eat it
+    game = Game(GameMode.walls, grid_size=2, snake=[(0, 1), (0, 0), (1, 0)])
+    assert game.food == (1, 1)
+    game.direction = Direction.RIGHT
+    game.step()
+    assert game.score == 10
+    assert game.is_game_over
+
+def test_free_cells_track_the_snake():
+    game = Game(GameMode.passthrough, seed=5)
+    for _ in range(200):
+        game.step()
+        if game.is_game_over:
+            break
+        occupied = set(game.snake)
+        assert len(game.free) == 400 - len(occupied)
+        assert all((cell in game.free) != (cell in occupied) for cell in [(x, y) for x in range(20) for y in range(20)])
+
+def test_free_cells_swap_remove():
+    free = FreeCells(3)
+    free.remove((0, 0))
+    free.remove((2, 2))
+    assert len(free) == 7
+    assert (0, 0) not in free and (2, 2) not in free and (1, 1) in free
+    with pytest.raises(KeyError):
+        free.remove((0, 0))
+
+    free.add((0, 0))
+    assert (0, 0) in free
+    rng = random.Random(0)
+    assert {free.choice(rng) for _ in range(500)} == {(x, y) for x in range(3) for y in range(3)} - {(2, 2)}
+
+def test_seeded_games_replay_identically():
+    def play(seed):
+        game = Game(GameMode.passthrough, seed=seed)
+        foods = []
+        for i in range(300):
+            game.change_direction([Direction.RIGHT, Direction.DOWN][i // 7 % 2])
+            game.step()
+            foods.append(game.food)
+        return foods
+
+    assert play(42) == play(42)
+    assert play(42) != play(43)
+
+def test_large_grid():
+    game = Game(GameMode.walls, grid_size=100, seed=1)
+    assert list(game.snake) == [(50, 50), (49, 50), (48, 50)]
+    assert len(game.free) == 100 * 100 - 3
+
+def test_calculate_speed():
+    assert calculate_speed(0) == 150
+    assert calculate_speed(50) == 145
+    assert calculate_speed(10_000) == 50
@@ -0,0 +1,134 @@
+import asyncio
+import os
+import subprocess
+import sys
+from pathlib import Path
+import pytest
+from httpx import AsyncClient
+from app import admission
+from app.admission import AdaptiveLimiter, AdmissionRejected
+
+BACKEND_DIR = Path(__file__).resolve().parent.parent
+
+def make_limiter(name: str = "test", **overrides) -> AdaptiveLimiter:
+    options = dict(
+        initial_limit=2,
+        min_limit=1,
+        max_limit=4,
+        max_queue=1,
+        queue_timeout=0.5,
+        target_latency=0.1,
+    )
+    options.update(overrides)
+    return AdaptiveLimiter(name, **options)
+
+@pytest.mark.asyncio
+async def test_limiter_queues_then_rejects():
+    limiter = make_limiter()
+    await limiter.acquire()
+    await limiter.acquire()
+
+    # Third request waits in the queue, fourth is shed immediately
+    queued = asyncio.create_task(limiter.acquire())
+    await asyncio.sleep(0)
+    assert limiter.stats().queued == 1
+    with pytest.raises(AdmissionRejected) as exc_info:
+        await limiter.acquire()
+    assert exc_info.value.retry_after >= 1
+
+    limiter.release(0.01)
+    await queued
+    stats = limiter.stats()
+    assert stats.inFlight == 2
+    assert stats.queued == 0
+    assert stats.admitted == 3
+    assert stats.rejected == 1
+
+@pytest.mark.asyncio
+async def test_limiter_queue_timeout():
+    limiter = make_limiter(initial_limit=1, queue_timeout=0.01)
+    await limiter.acquire()
+
+    with pytest.raises(AdmissionRejected):
+        await limiter.acquire()
+    assert limiter.stats().queued == 0
+
+@pytest.mark.asyncio
+async def test_limiter_adapts_to_latency():
+    limiter = make_limiter(initial_limit=4)
+
+    # Slow responses shrink the limit multiplicatively
+    for _ in range(10):
+        await limiter.acquire()
+        limiter.release(1.0)
+    assert limiter.current_limit == 1
+
+    # Fast responses while saturated grow it back
+    for _ in range(20):
+        await limiter.acquire()
+        limiter.release(0.01)
+    assert limiter.current_limit > 1
+
+@pytest.mark.asyncio
+async def test_write_endpoint_sheds_load(client: AsyncClient, monkeypatch):
+    limiter = make_limiter("write", initial_limit=1, max_queue=0)
+    monkeypatch.setitem(admission.limiters, "write", limiter)
+    await limiter.acquire()
+
+    response = await client.post("/auth/signup", json={
+        "email": "test@example.com",
+        "username": "testuser",
+        "password": "password123"
+    })
+    assert response.status_code == 503
+    assert int(response.headers["Retry-After"]) >= 1
+    assert response.json()["success"] is False
+
+    # Reads are not queued behind writes
+    response = await client.get("/leaderboard")
+    assert response.status_code == 200
+
+    response = await client.get("/metrics/admission")
+    stats = {s["name"]: s for s in response.json()["data"]}
+    assert stats["write"]["rejected"] == 1
+    assert stats["write"]["inFlight"] == 1
+
+    limiter.release(0.01)
+    response = await client.post("/auth/signup", json={
+        "email": "test@example.com",
+        "username": "testuser",
+        "password": "password123"
+    })
+    assert response.status_code == 201
+
+def test_write_limit_fits_connection_pool(monkeypatch):
+    from app.config import settings
+    from app.database import pool_capacity
+
+    # The default limits leave the reserved connections free in the real pool
+    in_use = admission.limiters["write"].max_limit + admission.limiters["bulk"].max_limit
+    assert in_use <= pool_capacity() - settings.ADMISSION_READ_RESERVED_CONNECTIONS
+
+    # A configured maximum larger than the pool allows is capped
+    monkeypatch.setattr(settings, "ADMISSION_WRITE_MAX_LIMIT", 32)
+    assert admission.write_max_limit(15) == 15 - admission.BULK_MAX_LIMIT - settings.ADMISSION_READ_RESERVED_CONNECTIONS
+    # An unsized pool never makes a checkout wait
+    assert admission.write_max_limit(None) == 32
+
+    # Below the cap, the configured maximum is used as-is
+    monkeypatch.setattr(settings, "ADMISSION_WRITE_MAX_LIMIT", 3)
+    assert admission.write_max_limit(15) == 3
+
+def test_in_memory_sqlite_engine():
+    # The engine is built at import, so import it fresh with the URL under test
+    script = (
+        "from app.database import engine, pool_capacity\n"
+        "from app.admission import limiters\n"
+        "print(type(engine.pool).__name__, pool_capacity(), limiters['write'].max_limit)\n"
+    )
+    env = {**os.environ, "DATABASE_URL": "sqlite+aiosqlite:///:memory:", "ADMISSION_WRITE_MAX_LIMIT": "20"}
+    result = subprocess.run(
+        [sys.executable, "-c", script], env=env, cwd=BACKEND_DIR, capture_output=True, text=True
+    )
+    assert result.returncode == 0, result.stderr
+    assert result.stdout.split() == ["StaticPool", "None", "20"]
@@ -0,0 +1,91 @@
+import pytest
+from httpx import AsyncClient
+from sqlalchemy.ext.asyncio import AsyncSession
+import app.database
+import app.routers.auth
+from app.availability import AvailabilityIndex, BloomFilter
+from app.db_models import User as DBUser
+
+def test_bloom_filter_has_no_false_negatives():
+    bloom = BloomFilter(capacity=1000, error_rate=0.01)
+    for i in range(1000):
+        bloom.add(f"user{i}")
+    assert all(f"user{i}" in bloom for i in range(1000))
+
+    false_positives = sum(f"other{i}" in bloom for i in range(10000))
+    assert false_positives < 300
+
+@pytest.fixture
+def db_lookups(monkeypatch):
+    calls = []
+    original = AvailabilityIndex._exists
+
+    async def counting_exists(self, session, column, value):
+        calls.append(value)
+        return await original(self, session, column, value)
+
+    monkeypatch.setattr(AvailabilityIndex, "_exists", counting_exists)
+    return calls
+
+@pytest.mark.asyncio
+async def test_available_without_db_lookup(client: AsyncClient, db_lookups):
+    response = await client.get("/auth/available", params={
+        "username": "never-registered-name",
+        "email": "never-registered@example.com"
+    })
+    assert response.status_code == 200
+    data = response.json()
+    assert data["success"] is True
+    assert data["data"] == {"username": True, "email": True}
+    assert db_lookups == []
+
+@pytest.mark.asyncio
+async def test_taken_after_signup(client: AsyncClient, db_lookups):
+    await client.post("/auth/signup", json={
+        "email": "taken@example.com",
+        "username": "takenuser",
+        "password": "password123"
+    })
+
+    response = await client.get("/auth/available?username=takenuser&email=taken@example.com")
+    assert response.json()["data"] == {"username": False, "email": False}
+    # Filter hits are confirmed against the unique columns
+    assert db_lookups == ["takenuser", "taken@example.com"]
+
+    response = await client.get("/auth/available?username=freeuser")
+    assert response.json()["data"] == {"username": True, "email": None}
+
+@pytest.mark.asyncio
+async def test_available_requires_a_field(client: AsyncClient):
+    response = await client.get("/auth/available")
+    assert response.json()["success"] is False
+
+@pytest.mark.asyncio
+async def test_load_from_users_table(test_db: AsyncSession):
+    test_db.add(DBUser(username="loaded", email="loaded@example.com", password_hash="x"))
+    await test_db.commit()
+
+    index = AvailabilityIndex(capacity=100)
+    await index.load(test_db)
+    assert "loaded" in index.usernames
+    assert "loaded@example.com" in index.emails
+    assert not await index.is_username_available(test_db, "loaded")
+    assert await index.is_email_available(test_db, "someone-else@example.com")
+
+@pytest.mark.asyncio
+async def test_signup_race_falls_back_to_constraint(client: AsyncClient, monkeypatch):
+    payload = {"email": "racer@example.com", "username": "racer", "password": "password123"}
+    await client.post("/auth/signup", json=payload)
+
+    # Another process registered the name: this process's index doesn't know about it
+    fresh_index = AvailabilityIndex(capacity=100)
+    monkeypatch.setattr(app.database, "availability_index", fresh_index)
+    monkeypatch.setattr(app.routers.auth, "availability_index", fresh_index)
+
+    response = await client.get("/auth/available?username=racer")
+    assert response.json()["data"]["username"] is True
+
+    response = await client.post("/auth/signup", json={**payload, "email": "racer2@example.com"})
+    data = response.json()
+    assert data["success"] is False
+    assert data["error"] == "User already exists"
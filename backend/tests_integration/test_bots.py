@@ -0,0 +1,81 @@
+import asyncio
+import logging
+import pytest
+from httpx import AsyncClient
+from app.bots import BotSwarm, measure
+from app.database import active_players_store
+from app.models import GameMode
+
+@pytest.mark.asyncio
+async def test_swarm_publishes_players(client: AsyncClient):
+    swarm = BotSwarm(5, seed=1)
+    swarm.publish_all()
+    try:
+        response = await client.get("/players")
+        players = response.json()["data"]
+        assert sorted(p["id"] for p in players) == [f"bot-{i}" for i in range(5)]
+
+        response = await client.get("/players/bot-3")
+        data = response.json()
+        assert data["success"] is True
+        assert data["data"]["username"] == "bot_3"
+        assert len(data["data"]["snake"]) == 3
+    finally:
+        active_players_store.clear()
+
+@pytest.mark.slow
+@pytest.mark.parametrize("policy", ["greedy", "wander"])
+def test_bots_play_and_respawn(policy):
+    swarm = BotSwarm(20, mode=GameMode.walls, policy=policy, seed=2)
+    try:
+        for _ in range(500):
+            swarm.tick_all()
+        assert swarm.ticks == 20 * 500
+        assert len(active_players_store) == 20
+        if policy == "greedy":
+            # Greedy bots eventually trap themselves and start a new game
+            assert swarm.games_finished > 0
+            assert any(bot.game.score > 0 for bot in swarm.bots)
+    finally:
+        active_players_store.clear()
+
+@pytest.mark.slow
+@pytest.mark.asyncio
+async def test_swarm_run_cleans_up():
+    swarm = BotSwarm(10, seed=3)
+    await swarm.run(duration=0.3)
+    assert swarm.ticks > 10
+    assert 0 <= swarm.max_lag < 0.3
+    assert not any(pid.startswith("bot-") for pid in active_players_store)
+
+@pytest.mark.slow
+@pytest.mark.asyncio
+async def test_measure_reports_lag():
+    result = await measure(10, requests=1, seed=4, run_seconds=0.3)
+    assert result["players"] == 10
+    assert result["players_endpoint_bytes"] > 0
+    assert result["ticks_per_second"] > 0
+    assert result["max_lag_ms"] >= 0
+    assert not active_players_store
+
+@pytest.mark.asyncio
+async def test_failed_score_submission_is_logged(monkeypatch, caplog):
+    async def fail(self, username, score, mode):
+        raise RuntimeError("database unavailable")
+
+    monkeypatch.setattr(BotSwarm, "_submit", fail)
+    swarm = BotSwarm(1, submit_scores=True, seed=5)
+    bot = swarm.bots[0]
+    bot.game.score = 10
+    try:
+        with caplog.at_level(logging.ERROR, logger="app.bots"):
+            swarm._finish(bot)
+            await asyncio.gather(*swarm._pending, return_exceptions=True)
+            await asyncio.sleep(0)
+    finally:
+        active_players_store.clear()
+
+    assert not swarm._pending
+    failures = [r for r in caplog.records if r.message == "Bot score submission failed"]
+    assert len(failures) == 1
+    assert "database unavailable" in failures[0].exc_text
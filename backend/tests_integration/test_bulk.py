@@ -0,0 +1,219 @@
+import csv
+import io
+import json
+import os
+import time
+import pytest
+from httpx import AsyncClient
+from sqlalchemy import delete, func, select
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.bulk import BulkImportError, generate_leaderboard, import_leaderboard
+from app.config import settings
+from app.db_models import LeaderboardEntry
+from app.models import ExportFormat
+
+ADMIN_EMAIL = "admin@example.com"
+ADMIN_HEADERS = {"Authorization": f"Bearer {ADMIN_EMAIL}"}
+
+@pytest.fixture
+def admin(monkeypatch):
+    monkeypatch.setattr(settings, "ADMIN_EMAILS", [ADMIN_EMAIL])
+
+async def signup_admin(client: AsyncClient):
+    await client.post("/auth/signup", json={
+        "email": ADMIN_EMAIL,
+        "username": "admin",
+        "password": "password123"
+    })
+
+@pytest.mark.asyncio
+async def test_export_requires_admin(client: AsyncClient):
+    await signup_admin(client)
+
+    response = await client.get("/leaderboard/export", headers=ADMIN_HEADERS)
+    assert response.status_code == 403
+
+@pytest.mark.asyncio
+async def test_export_ndjson(client: AsyncClient, admin):
+    await signup_admin(client)
+    await client.post("/leaderboard", json={"score": 500, "mode": "walls"}, headers=ADMIN_HEADERS)
+    await client.post("/leaderboard", json={"score": 200, "mode": "passthrough"}, headers=ADMIN_HEADERS)
+
+    response = await client.get("/leaderboard/export", headers=ADMIN_HEADERS)
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("application/x-ndjson")
+    rows = [json.loads(line) for line in response.text.splitlines()]
+    assert sorted((r["score"], r["mode"]) for r in rows) == [(200, "passthrough"), (500, "walls")]
+    assert all(r["username"] == "admin" for r in rows)
+
+@pytest.mark.asyncio
+async def test_export_csv(client: AsyncClient, admin):
+    await signup_admin(client)
+    await client.post("/leaderboard", json={"score": 500, "mode": "walls"}, headers=ADMIN_HEADERS)
+
+    response = await client.get("/leaderboard/export?format=csv", headers=ADMIN_HEADERS)
+    assert response.status_code == 200
+    rows = list(csv.DictReader(io.StringIO(response.text)))
+    assert len(rows) == 1
+    assert rows[0]["score"] == "500"
+    assert rows[0]["mode"] == "walls"
+
+@pytest.mark.asyncio
+async def test_import_roundtrip(client: AsyncClient, admin, monkeypatch):
+    await signup_admin(client)
+    monkeypatch.setattr(settings, "IMPORT_BATCH_SIZE", 2)
+
+    body = "\n".join(
+        json.dumps({"username": f"player{i}", "score": i * 100, "mode": "walls", "date": "2024-01-01"})
+        for i in range(5)
+    )
+    response = await client.post("/leaderboard/import", content=body, headers=ADMIN_HEADERS)
+    assert response.status_code == 200
+    data = response.json()
+    assert data["success"] is True
+    assert data["data"] == {"imported": 5, "batches": 3}
+
+    response = await client.get("/leaderboard?mode=walls")
+    entries = response.json()["data"]
+    assert [e["score"] for e in entries] == [400, 300, 200, 100, 0]
+
+    # Re-importing an export keeps ids, so it conflicts instead of duplicating
+    export = await client.get("/leaderboard/export", headers=ADMIN_HEADERS)
+    response = await client.post("/leaderboard/import", content=export.text, headers=ADMIN_HEADERS)
+    data = response.json()
+    assert data["success"] is False
+    assert data["error"].startswith("Batch 1")
+    assert data["data"] == {"imported": 0, "batches": 0}
+
+@pytest.mark.asyncio
+async def test_csv_roundtrip_with_newline_and_comma(client: AsyncClient, test_db: AsyncSession, admin):
+    await signup_admin(client)
+    rows = [
+        {"username": "bad\nname", "score": 300, "mode": "walls", "date": "2024-01-01"},
+        {"username": 'comma, "quoted"', "score": 200, "mode": "passthrough", "date": "2024-01-02"},
+        {"username": "plain", "score": 100, "mode": "walls", "date": "2024-01-03"},
+    ]
+    body = "\n".join(json.dumps(row) for row in rows)
+    response = await client.post("/leaderboard/import", content=body, headers=ADMIN_HEADERS)
+    assert response.json()["data"]["imported"] == 3
+
+    export = await client.get("/leaderboard/export?format=csv", headers=ADMIN_HEADERS)
+    before = sorted(csv.DictReader(io.StringIO(export.text)), key=lambda r: r["id"])
+
+    # Empty the table and load the CSV back: ids and values must survive
+    await test_db.execute(delete(LeaderboardEntry))
+    await test_db.commit()
+    response = await client.post("/leaderboard/import?format=csv", content=export.text, headers=ADMIN_HEADERS)
+    data = response.json()
+    assert data["success"] is True
+    assert data["data"]["imported"] == 3
+
+    export = await client.get("/leaderboard/export?format=csv", headers=ADMIN_HEADERS)
+    after = sorted(csv.DictReader(io.StringIO(export.text)), key=lambda r: r["id"])
+    assert after == before
+    assert {r["username"] for r in after} == {"bad\nname", 'comma, "quoted"', "plain"}
+
+@pytest.mark.asyncio
+async def test_import_csv_invalid_line(client: AsyncClient, admin):
+    await signup_admin(client)
+
+    body = "username,score,mode\nplayer1,100,walls\nplayer2,abc,walls\n"
+    response = await client.post("/leaderboard/import?format=csv", content=body, headers=ADMIN_HEADERS)
+    data = response.json()
+    assert data["success"] is False
+    assert data["error"].startswith("Line 3")
+    assert data["data"] == {"imported": 0, "batches": 0}
+
+@pytest.mark.asyncio
+async def test_import_failure_reports_committed_batches(client: AsyncClient, admin, monkeypatch):
+    await signup_admin(client)
+    monkeypatch.setattr(settings, "IMPORT_BATCH_SIZE", 2)
+
+    lines = [json.dumps({"username": f"player{i}", "score": i, "mode": "walls"}) for i in range(3)]
+    lines.append('{"username": "broken"')
+    response = await client.post("/leaderboard/import", content="\n".join(lines), headers=ADMIN_HEADERS)
+    data = response.json()
+    assert data["success"] is False
+    assert data["error"].startswith("Line 4")
+    # The first batch of two was committed before the bad line
+    assert data["data"] == {"imported": 2, "batches": 1}
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("line, field", [
+    ("[1, 2]", "record"),
+    ('{"username": 5, "score": 1, "mode": "walls"}', "username"),
+    ('{"username": "big", "score": 10000000000, "mode": "walls"}', "score"),
+])
+async def test_import_rejects_malformed_records(client: AsyncClient, admin, line: str, field: str):
+    await signup_admin(client)
+
+    body = json.dumps({"username": "ok", "score": 1, "mode": "walls"}) + "\n" + line
+    response = await client.post("/leaderboard/import", content=body, headers=ADMIN_HEADERS)
+    assert response.status_code == 200
+    data = response.json()
+    assert data["success"] is False
+    assert data["error"].startswith(f"Line 2: invalid record ({field}:")
+    assert data["data"] == {"imported": 0, "batches": 0}
+
+@pytest.mark.asyncio
+async def test_import_csv_unterminated_quote(client: AsyncClient, admin):
+    await signup_admin(client)
+
+    body = 'username,score,mode\n"never closed,100,walls\n'
+    response = await client.post("/leaderboard/import?format=csv", content=body, headers=ADMIN_HEADERS)
+    data = response.json()
+    assert data["success"] is False
+    assert "unterminated" in data["error"]
+
+@pytest.mark.slow
+@pytest.mark.asyncio
+@pytest.mark.parametrize("fmt", list(ExportFormat))
+async def test_import_generated_rows(test_db: AsyncSession, fmt: ExportFormat):
+    # BULK_TEST_ROWS=2000000 re-runs the multi-million-row import check
+    rows = int(os.environ.get("BULK_TEST_ROWS", 20000))
+
+    async def chunks():
+        for chunk in generate_leaderboard(rows, fmt):
+            yield chunk.encode("utf-8")
+
+    started = time.perf_counter()
+    result = await import_leaderboard(test_db, chunks(), fmt, batch_size=5000)
+    elapsed = time.perf_counter() - started
+    print(f"{fmt.value}: {rows} rows in {elapsed:.1f}s ({rows / elapsed:.0f} rows/s)")
+
+    assert result.imported == rows
+    count = await test_db.scalar(select(func.count()).select_from(LeaderboardEntry))
+    assert count == rows
+    odd = await test_db.scalar(select(LeaderboardEntry.username).where(LeaderboardEntry.username.contains("\n")).limit(1))
+    assert odd == 'player "0",\nline two'
+
+@pytest.mark.asyncio
+async def test_import_stops_buffering_unterminated_csv(test_db: AsyncSession, monkeypatch):
+    monkeypatch.setattr(settings, "IMPORT_MAX_RECORD_BYTES", 1000)
+    consumed = 0
+
+    async def chunks():
+        nonlocal consumed
+        yield b'username,score,mode\nok,1,walls\n"never closed,100,walls\n'
+        for _ in range(10000):
+            consumed += 1
+            yield b"more,1,walls\n"
+
+    with pytest.raises(BulkImportError) as info:
+        await import_leaderboard(test_db, chunks(), ExportFormat.csv)
+    assert str(info.value).startswith("Line 3: unterminated quoted field")
+    # Failed as soon as the record outgrew the limit, not at the end of the file
+    assert consumed < 100
+
+@pytest.mark.asyncio
+async def test_import_rejects_overlong_line(test_db: AsyncSession, monkeypatch):
+    monkeypatch.setattr(settings, "IMPORT_MAX_RECORD_BYTES", 1000)
+
+    async def chunks():
+        yield b'{"username": "ok", "score": 1, "mode": "walls"}\n'
+        for _ in range(100):
+            yield b"x" * 100
+
+    with pytest.raises(BulkImportError) as info:
+        await import_leaderboard(test_db, chunks())
+    assert str(info.value).startswith("Line 2: longer than IMPORT_MAX_RECORD_BYTES")
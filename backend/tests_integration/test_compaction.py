@@ -0,0 +1,84 @@
+import asyncio
+import logging
+import pytest
+from datetime import date, timedelta
+from sqlalchemy import func
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.future import select
+from app import compaction
+from app.compaction import compact_leaderboard, run_compaction_forever
+from app.db_models import LeaderboardArchiveEntry, LeaderboardEntry
+from app.models import GameMode
+
+OLD = date.today() - timedelta(days=60)
+
+async def seed(session: AsyncSession):
+    # walls: 10 old rows scoring 0..900 plus one recent low score
+    for i in range(10):
+        session.add(LeaderboardEntry(username=f"w{i}", score=i * 100, mode=GameMode.walls, date=OLD))
+    session.add(LeaderboardEntry(username="recent", score=1, mode=GameMode.walls, date=date.today()))
+    # passthrough: fewer rows than the retained top, so all are kept
+    for i in range(2):
+        session.add(LeaderboardEntry(username=f"p{i}", score=i, mode=GameMode.passthrough, date=OLD))
+    await session.commit()
+
+async def count(session: AsyncSession, model) -> int:
+    return (await session.execute(select(func.count()).select_from(model))).scalar_one()
+
+@pytest.mark.asyncio
+async def test_compaction_dry_run(test_db: AsyncSession):
+    await seed(test_db)
+
+    result = await compact_leaderboard(test_db, retain_top=3, min_age_days=30, batch_size=2, dry_run=True)
+    assert result.dryRun is True
+    # walls scores 0..600 are below the top 3 (700, 800, 900) and old enough
+    assert result.rows == 7
+    assert result.bytes > 0
+    assert await count(test_db, LeaderboardEntry) == 13
+    assert await count(test_db, LeaderboardArchiveEntry) == 0
+
+@pytest.mark.asyncio
+async def test_compaction_moves_rows_in_batches(test_db: AsyncSession):
+    await seed(test_db)
+    dry_run = await compact_leaderboard(test_db, retain_top=3, min_age_days=30, batch_size=2, dry_run=True)
+
+    result = await compact_leaderboard(test_db, retain_top=3, min_age_days=30, batch_size=2)
+    assert result.rows == 7
+    assert result.batches == 4
+    assert result.bytes == dry_run.bytes
+
+    remaining = (await test_db.execute(select(LeaderboardEntry.username))).scalars().all()
+    assert sorted(remaining) == ["p0", "p1", "recent", "w7", "w8", "w9"]
+    archived = (await test_db.execute(select(LeaderboardArchiveEntry))).scalars().all()
+    assert sorted(a.score for a in archived) == [0, 100, 200, 300, 400, 500, 600]
+    assert all(a.archived_at is not None for a in archived)
+
+    # Nothing left to do on a second run
+    result = await compact_leaderboard(test_db, retain_top=3, min_age_days=30, batch_size=2)
+    assert result.rows == 0
+
+@pytest.mark.asyncio
+async def test_compaction_requires_retained_rows(test_db: AsyncSession):
+    await seed(test_db)
+
+    with pytest.raises(ValueError):
+        await compact_leaderboard(test_db, retain_top=0, min_age_days=30, batch_size=2)
+    assert await count(test_db, LeaderboardEntry) == 13
+
+@pytest.mark.asyncio
+async def test_compaction_loop_logs_failures(monkeypatch, caplog):
+    async def fail(*args, **kwargs):
+        raise RuntimeError("database unavailable")
+
+    monkeypatch.setattr(compaction, "compact_leaderboard", fail)
+    task = asyncio.create_task(run_compaction_forever(interval=0.01))
+    with caplog.at_level(logging.ERROR, logger="app.compaction"):
+        await asyncio.sleep(0.05)
+        # The loop survives the failure
+        assert not task.done()
+    task.cancel()
+    await asyncio.gather(task, return_exceptions=True)
+
+    failures = [r for r in caplog.records if r.message == "Leaderboard compaction failed"]
+    assert failures
+    assert "database unavailable" in failures[0].exc_text